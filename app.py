@@ -84,6 +84,11 @@ def check_work_patterns():
                     enhanced_stats['focus_mode'] = activity_tracker.get_focus_mode()
                     enhanced_stats['active_processes'] = activity_tracker.perceptions.get('active_apps', [])[:3]
                     
+                    # Don't interrupt deep focus yet, and skip the LLM call entirely
+                    if wellness_suggestions.is_protected_deep_focus(enhanced_stats['focus_level'],
+                                                                   active_duration.total_seconds() / 60):
+                        return None
+                    
                     break_suggestion = wellness_suggestions.get_break_suggestion(enhanced_stats)
                     breaks_suggested += 1
                     
@@ -1,7 +1,10 @@
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
+import functools
 import json
 import os
+import time
+from collections import OrderedDict
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
@@ -15,6 +18,52 @@ import logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Fetched events keyed by (source, start, end), reused for a short while across polls.
+# Kept in fetch order so expired entries can be dropped from the front.
+_EVENTS_CACHE: "OrderedDict[Tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+_EVENTS_CACHE_TTL = 60  # seconds
+_EVENTS_CACHE_MAXSIZE = 32
+
+@functools.lru_cache(maxsize=1)
+def _get_google_services(calendar_id: str, scopes: Tuple[str, ...]) -> Tuple[object, Optional[str]]:
+    """
+    Authorize and build the Google Calendar client once per process.
+    
+    The discovery build and the userinfo lookup are shared by every CalendarService
+    created with the same calendar ID and scopes. Failures raise and are not cached.
+    
+    Returns:
+        Tuple of (calendar API service, user email)
+    """
+    creds = None
+    
+    token_path = Config.get_token_path()
+    if os.path.exists(token_path):
+        creds = Credentials.from_authorized_user_file(token_path, list(scopes))
+        
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            client_secret_path = Config.get_client_secret_path()
+            if not os.path.exists(client_secret_path):
+                raise FileNotFoundError(client_secret_path)
+                
+            flow = InstalledAppFlow.from_client_secrets_file(
+                client_secret_path, list(scopes))
+            creds = flow.run_local_server(port=0)
+            
+        with open(token_path, 'w') as token:
+            token.write(creds.to_json())
+            
+    calendar_service = build('calendar', 'v3', credentials=creds)
+    
+    # Fetch user email
+    user_info_service = build('oauth2', 'v2', credentials=creds)
+    user_info = user_info_service.userinfo().get().execute()
+    
+    return calendar_service, user_info.get('email')
+
 class CalendarService:
     def __init__(self, use_google_calendar: Optional[bool] = None, mock_time: Optional[datetime] = None):
         """
@@ -47,38 +96,15 @@ class CalendarService:
         Set up Google Calendar API client.
         Returns True if setup was successful, False otherwise.
         """
-        creds = None
-        
         try:
-            token_path = Config.get_token_path()
-            if os.path.exists(token_path):
-                creds = Credentials.from_authorized_user_file(token_path, Config.GOOGLE_API_SCOPES)
-                
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    client_secret_path = Config.get_client_secret_path()
-                    if not os.path.exists(client_secret_path):
-                        print(f"Error: {Config.GOOGLE_CLIENT_SECRET_FILE} not found. Please download it from Google Cloud Console.")
-                        return False
-                        
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        client_secret_path, Config.GOOGLE_API_SCOPES)
-                    creds = flow.run_local_server(port=0)
-                    
-                with open(token_path, 'w') as token:
-                    token.write(creds.to_json())
-                    
-            self.google_calendar_service = build('calendar', 'v3', credentials=creds)
-            
-            # Fetch user email
-            user_info_service = build('oauth2', 'v2', credentials=creds)
-            user_info = user_info_service.userinfo().get().execute()
-            self.user_email = user_info.get('email')
-            
+            self.google_calendar_service, self.user_email = _get_google_services(
+                self.calendar_id, tuple(Config.GOOGLE_API_SCOPES)
+            )
             return True
             
+        except FileNotFoundError:
+            print(f"Error: {Config.GOOGLE_CLIENT_SECRET_FILE} not found. Please download it from Google Cloud Console.")
+            return False
         except Exception as e:
             print(f"Error setting up Google Calendar: {str(e)}")
             return False
@@ -101,17 +127,98 @@ class CalendarService:
             
         return datetime.now(self.timezone)
     
-    def get_day_events(self, target_date: Optional[datetime] = None) -> List[Dict]:
-        """Get all events for a specific day."""
+    def get_day_range(self, target_date: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+        """Get the (start, end) range queried by get_day_events."""
         if not target_date:
             target_date = self.get_current_time()
             
         start_of_day = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
         end_of_day = start_of_day + timedelta(days=1)
+        return start_of_day, end_of_day
+    
+    def get_day_events(self, target_date: Optional[datetime] = None) -> List[Dict]:
+        """Get all events for a specific day."""
+        start_of_day, end_of_day = self.get_day_range(target_date)
+        return self._get_events_for_range_cached(start_of_day, end_of_day)
+    
+    def _get_events_for_range_cached(self, start_time: datetime, end_time: datetime) -> List[Dict]:
+        """
+        Get events for a time range, reusing a recent fetch of the same range.
+        
+        Results are cached per calendar (or local calendar file) and range for
+        _EVENTS_CACHE_TTL seconds, so repeated polls skip the API round-trip.
+        Expired entries are evicted on insert and at most _EVENTS_CACHE_MAXSIZE are kept.
+        """
+        source = self.calendar_id if self.use_google_calendar else str(self.local_calendar_file)
+        key = (self.use_google_calendar, source, start_time, end_time)
+        now = time.monotonic()
+        
+        cached = _EVENTS_CACHE.get(key)
+        if cached is not None and now - cached[0] < _EVENTS_CACHE_TTL:
+            return list(cached[1])
         
         if self.use_google_calendar:
-            return self._get_google_calendar_events_for_range(start_of_day, end_of_day)
-        return self._get_local_calendar_events_for_range(start_of_day, end_of_day)
+            events = self._get_google_calendar_events_for_range(start_time, end_time)
+        else:
+            events = self._get_local_calendar_events_for_range(start_time, end_time)
+        
+        _EVENTS_CACHE[key] = (now, events)
+        _EVENTS_CACHE.move_to_end(key)
+        
+        # Ranges that follow "now" add a new key on every poll, so prune as we insert
+        while _EVENTS_CACHE:
+            oldest_key, (fetched_at, _) = next(iter(_EVENTS_CACHE.items()))
+            if now - fetched_at < _EVENTS_CACHE_TTL and len(_EVENTS_CACHE) <= _EVENTS_CACHE_MAXSIZE:
+                break
+            del _EVENTS_CACHE[oldest_key]
+        return list(events)
+    
+    def batch(self, callback=None):
+        """
+        Create a batch request so several Google Calendar calls share one HTTP round-trip.
+        
+        Args:
+            callback: Optional function called as callback(request_id, response, exception)
+                      for each request in the batch
+        
+        Returns:
+            A googleapiclient BatchHttpRequest, or None if Google Calendar is not set up
+        """
+        if not self.google_calendar_service:
+            return None
+        return self.google_calendar_service.new_batch_http_request(callback=callback)
+    
+    def events_list_request(self, start_time: datetime, end_time: datetime):
+        """Build (without executing) an events.list request for a time range."""
+        # Convert to UTC for Google Calendar API
+        start_time_utc = start_time.astimezone(pytz.UTC)
+        end_time_utc = end_time.astimezone(pytz.UTC)
+        
+        return self.google_calendar_service.events().list(
+            calendarId=self.calendar_id,
+            timeMin=start_time_utc.isoformat(),
+            timeMax=end_time_utc.isoformat(),
+            singleEvents=True,
+            orderBy='startTime'
+        )
+    
+    def freebusy_request(self, start_time: datetime, end_time: datetime):
+        """Build (without executing) a freebusy.query request for a time range."""
+        return self.google_calendar_service.freebusy().query(body={
+            'timeMin': start_time.astimezone(pytz.UTC).isoformat(),
+            'timeMax': end_time.astimezone(pytz.UTC).isoformat(),
+            'items': [{'id': self.calendar_id}]
+        })
+    
+    def parse_freebusy_response(self, response: Dict) -> List[Tuple[datetime, datetime]]:
+        """Convert a freebusy.query response into sorted (start, end) busy slots."""
+        busy = response.get('calendars', {}).get(self.calendar_id, {}).get('busy', [])
+        busy_times = [
+            (datetime.fromisoformat(slot['start'].replace('Z', '+00:00')).astimezone(self.timezone),
+             datetime.fromisoformat(slot['end'].replace('Z', '+00:00')).astimezone(self.timezone))
+            for slot in busy
+        ]
+        return sorted(busy_times, key=lambda x: x[0])
     
     def _get_google_calendar_events_for_range(self, start_time: datetime, end_time: datetime) -> List[Dict]:
         """Fetch events from Google Calendar for a specific time range."""
@@ -119,51 +226,44 @@ class CalendarService:
             return []
             
         try:
-            # Convert to UTC for Google Calendar API
-            start_time_utc = start_time.astimezone(pytz.UTC)
-            end_time_utc = end_time.astimezone(pytz.UTC)
-            
-            events_result = self.google_calendar_service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=start_time_utc.isoformat(),
-                timeMax=end_time_utc.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            formatted_events = []
-            
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                # Convert to datetime objects in local timezone
-                start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')).astimezone(self.timezone)
-                end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')).astimezone(self.timezone)
-                
-                formatted_events.append({
-                    'summary': event.get('summary', 'Untitled Event'),
-                    'start': start_dt.isoformat(),
-                    'end': end_dt.isoformat(),
-                    'id': event['id'],
-                    'description': event.get('description', ''),
-                    'location': event.get('location', ''),
-                    'attendees': [
-                        attendee.get('email') 
-                        for attendee in event.get('attendees', [])
-                        if attendee.get('email')
-                    ],
-                    'organizer': event.get('organizer', {}).get('email'),
-                    'status': event.get('status', 'confirmed')
-                })
-            
-            return formatted_events
+            events_result = self.events_list_request(start_time, end_time).execute()
+            return self.format_google_events(events_result)
             
         except HttpError as error:
             print(f"Error fetching Google Calendar events: {str(error)}")
             return []
     
+    def format_google_events(self, events_result: Dict) -> List[Dict]:
+        """Convert an events.list response into the service's event format."""
+        events = events_result.get('items', [])
+        formatted_events = []
+        
+        for event in events:
+            start = event['start'].get('dateTime', event['start'].get('date'))
+            end = event['end'].get('dateTime', event['end'].get('date'))
+            
+            # Convert to datetime objects in local timezone
+            start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')).astimezone(self.timezone)
+            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')).astimezone(self.timezone)
+            
+            formatted_events.append({
+                'summary': event.get('summary', 'Untitled Event'),
+                'start': start_dt.isoformat(),
+                'end': end_dt.isoformat(),
+                'id': event['id'],
+                'description': event.get('description', ''),
+                'location': event.get('location', ''),
+                'attendees': [
+                    attendee.get('email') 
+                    for attendee in event.get('attendees', [])
+                    if attendee.get('email')
+                ],
+                'organizer': event.get('organizer', {}).get('email'),
+                'status': event.get('status', 'confirmed')
+            })
+        
+        return formatted_events
+    
     def _get_local_calendar_events_for_range(self, start_time: datetime, end_time: datetime) -> List[Dict]:
         """Fetch events from local JSON calendar file for a specific time range."""
         logger.debug(f"Checking local calendar file: {self.local_calendar_file}")
@@ -238,13 +338,18 @@ class CalendarService:
             logger.error(f"Error reading local calendar: {str(e)}")
             return []
     
-    def get_upcoming_events(self, minutes_ahead: int = 120) -> List[Dict]:
-        """Get upcoming calendar events within the specified time window."""
+    def get_upcoming_range(self) -> Tuple[datetime, datetime]:
+        """Get the (start, end) range queried by get_upcoming_events."""
         now = self.get_current_time()
         
         # Get all events for today
         start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
         end_of_day = start_of_day.replace(hour=23, minute=59, second=59)
+        return start_of_day, end_of_day
+    
+    def get_upcoming_events(self, minutes_ahead: int = 120) -> List[Dict]:
+        """Get upcoming calendar events within the specified time window."""
+        start_of_day, end_of_day = self.get_upcoming_range()
         
         logger.debug(f"Looking for events between {start_of_day} and {end_of_day} (local timezone)")
         
@@ -267,36 +372,47 @@ class CalendarService:
     def get_next_free_slot(self, min_duration: int = 15) -> Optional[datetime]:
         """Find the next free time slot with at least min_duration minutes."""
         events = self.get_upcoming_events(240)  # Look ahead 4 hours
+        return self.find_free_slot(events, min_duration)
+    
+    def find_free_slot(self, events: List[Dict], min_duration: int = 15) -> Optional[datetime]:
+        """Find the first free slot of at least min_duration minutes around already-fetched events."""
         if not events:
             return datetime.now(self.timezone)
             
-        now = datetime.now(self.timezone)
-        for i in range(len(events)):
-            current_event_end = datetime.fromisoformat(events[i]['end']).astimezone(self.timezone)
-            next_event_start = (datetime.fromisoformat(events[i + 1]['start']).astimezone(self.timezone) 
-                              if i + 1 < len(events) else None)
-            
-            if next_event_start is None:
-                return current_event_end
-            
-            gap = (next_event_start - current_event_end).total_seconds() / 60
+        busy_times = self._merge_busy_times(self._event_intervals(events))
+        
+        # Sweep the gaps between merged busy blocks
+        for (_, busy_end), (next_start, _) in zip(busy_times, busy_times[1:]):
+            gap = (next_start - busy_end).total_seconds() / 60
             if gap >= min_duration:
-                return current_event_end
+                return busy_end
         
-        return None
+        return busy_times[-1][1]
+    
+    def _event_intervals(self, events: List[Dict]) -> List[Tuple[datetime, datetime]]:
+        """Convert formatted events to (start, end) tuples in the calendar's timezone."""
+        return [
+            (datetime.fromisoformat(event['start']).astimezone(self.timezone),
+             datetime.fromisoformat(event['end']).astimezone(self.timezone))
+            for event in events
+        ]
+    
+    @staticmethod
+    def _merge_busy_times(intervals: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+        """Sort (start, end) intervals once and coalesce overlapping or touching ones."""
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
     
     def get_busy_times(self, start_date: datetime, end_date: datetime) -> List[Tuple[datetime, datetime]]:
-        """Get busy time slots between start_date and end_date."""
-        events = self._get_google_calendar_events_for_range(start_date, end_date) if self.use_google_calendar \
-                else self._get_local_calendar_events_for_range(start_date, end_date)
-        
-        busy_times = []
-        for event in events:
-            start = datetime.fromisoformat(event['start']).astimezone(self.timezone)
-            end = datetime.fromisoformat(event['end']).astimezone(self.timezone)
-            busy_times.append((start, end))
+        """Get merged busy time slots between start_date and end_date."""
+        events = self._get_events_for_range_cached(start_date, end_date)
         
-        return sorted(busy_times, key=lambda x: x[0])
+        return self._merge_busy_times(self._event_intervals(events))
 
     def get_status(self) -> Dict:
         """Get status information about the calendar service."""
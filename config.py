@@ -1,4 +1,5 @@
 import os
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 import pytz
@@ -12,6 +13,11 @@ try:
 except ImportError:
     logging.info("python-dotenv not installed, using existing environment variables")
 
+@functools.lru_cache(maxsize=None)
+def _load_timezone(tz_string: str) -> pytz.timezone:
+    """Look up a pytz timezone once per name."""
+    return pytz.timezone(tz_string)
+
 class Config:
     @staticmethod
     def validate_timezone(tz_string: str) -> str:
@@ -57,13 +63,16 @@ class Config:
     # Local Calendar Settings
     LOCAL_CALENDAR_FILE = os.getenv('LOCAL_CALENDAR_FILE', 'local_calendar_current.json')
     
+    # Ollama Settings
+    OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'tinyllama:latest')
+    
     # Scheduler settings
     SCHEDULER_FREQUENCY = int(os.getenv('SCHEDULER_FREQUENCY', '300'))  # Default to 300 seconds (5 minutes)
     
     @classmethod
     def get_timezone(cls) -> pytz.timezone:
         """Get the configured timezone as a pytz timezone object."""
-        return pytz.timezone(cls.TIMEZONE)
+        return _load_timezone(cls.TIMEZONE)
     
     @classmethod
     def get_mock_time(cls) -> datetime:
@@ -2,16 +2,46 @@ import json
 import os
 import threading
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import copy
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+def _serialize_context(context: Dict[str, Any], pretty: bool = True) -> bytes:
+    """
+    Serialize a context dictionary to JSON bytes.
+    
+    Uses orjson when it is installed and falls back to the stdlib json module.
+    
+    Args:
+        context: Context dictionary to serialize
+        pretty: Whether to indent the output for readability
+    
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(context, option=options, default=str)
+    return json.dumps(context, indent=2 if pretty else None, default=str).encode("utf-8")
+
+
 class ContextManager:
     """
     Manages a shared context dictionary accessible to all agents in the system.
     Provides thread-safe access and persistence capabilities.
+    
+    The context is copy-on-write: writers build a new dictionary under the lock and
+    publish it with a single reference swap, so readers never need the lock.
     """
     
     # Singleton instance
@@ -29,7 +59,7 @@ class ContextManager:
         if self._initialized:
             return
             
-        self._context = {}
+        self._context = {}  # Published snapshot, never mutated in place
         self._subscribers = {}
         self._context_file = "data/agent_context.json"
         self._backup_directory = "data/context_backups"
@@ -53,21 +83,22 @@ class ContextManager:
         Returns:
             A copy of the requested context to prevent direct modification
         """
-        with self._lock:
-            if path is None:
-                return copy.deepcopy(self._context)
-            
-            # Navigate through nested dictionaries with the path
-            parts = path.split('.')
-            current = self._context
-            
-            try:
-                for part in parts:
-                    current = current[part]
-                return copy.deepcopy(current)
-            except (KeyError, TypeError):
-                logger.warning(f"Path {path} not found in context")
-                return {}
+        # Lock-free read of the current snapshot
+        context = self._context
+        if path is None:
+            return copy.deepcopy(context)
+        
+        # Navigate through nested dictionaries with the path
+        parts = path.split('.')
+        current = context
+        
+        try:
+            for part in parts:
+                current = current[part]
+            return copy.deepcopy(current)
+        except (KeyError, TypeError):
+            logger.warning(f"Path {path} not found in context")
+            return {}
     
     def update_context(self, update: Dict[str, Any], agent_id: str = "system") -> None:
         """
@@ -88,55 +119,92 @@ class ContextManager:
             logger.info(f"Context update by {agent_id} at {timestamp}")
             
             # Track what changed for notifications
-            changed_keys = self._deep_update(self._context, update)
+            context, changed_keys = self._deep_update(self._context, update)
             
             # Add metadata about this update
-            if "metadata" not in self._context:
-                self._context["metadata"] = {}
+            metadata = dict(context.get("metadata", {}))
+            metadata["last_updated"] = timestamp
+            metadata["last_updated_by"] = agent_id
+            context["metadata"] = metadata
             
-            self._context["metadata"]["last_updated"] = timestamp
-            self._context["metadata"]["last_updated_by"] = agent_id
+            # Publish the new snapshot
+            self._context = context
             
             # Notify subscribers about the changes
             self._notify_subscribers(changed_keys, agent_id)
     
+    def replace_context(self, new_context: Dict[str, Any], agent_id: str = "system") -> None:
+        """
+        Replace the whole context (except metadata) with new values.
+        
+        Equivalent to clear_context() followed by update_context(), but done under
+        a single lock acquisition with one round of subscriber notifications.
+        
+        Args:
+            new_context: Dictionary to use as the new context
+            agent_id: ID of the agent making the update (for logging)
+        """
+        with self._lock:
+            timestamp = datetime.now().isoformat()
+            logger.info(f"Context replaced by {agent_id} at {timestamp}")
+            
+            # Keep metadata, drop everything else
+            context, changed_keys = self._deep_update(
+                {"metadata": self._context.get("metadata", {})}, new_context
+            )
+            
+            metadata = dict(context["metadata"])
+            metadata["cleared_at"] = timestamp
+            metadata["last_updated"] = timestamp
+            metadata["last_updated_by"] = agent_id
+            context["metadata"] = metadata
+            
+            self._context = context
+            
+            self._notify_subscribers(changed_keys, agent_id)
+    
     def _deep_update(self, target: Dict[str, Any], update: Dict[str, Any], 
-                    prefix: str = "") -> list:
+                    prefix: str = "") -> Tuple[Dict[str, Any], list]:
         """
-        Recursively update nested dictionaries and track changed keys.
+        Recursively merge updates into a copy of nested dictionaries and track changed keys.
+        
+        The target is left untouched; only the dictionaries along updated paths are
+        copied, everything else is shared with the target.
         
         Args:
-            target: Target dictionary to update
+            target: Target dictionary to merge into
             update: Dictionary with updates to apply
             prefix: Current path prefix for tracking
             
         Returns:
-            List of changed keys with their paths
+            Tuple of (updated copy of target, list of changed keys with their paths)
         """
+        result = dict(target)
         changed_keys = []
         
         for key, value in update.items():
             path = f"{prefix}.{key}" if prefix else key
             
             # If both are dictionaries, recursively update
-            if (key in target and isinstance(target[key], dict) and 
+            if (key in result and isinstance(result[key], dict) and 
                 isinstance(value, dict)):
-                nested_changes = self._deep_update(target[key], value, path)
+                result[key], nested_changes = self._deep_update(result[key], value, path)
                 changed_keys.extend(nested_changes)
             else:
                 # Check if value is actually changing
-                if key not in target or target[key] != value:
-                    target[key] = value
+                if key not in result or result[key] != value:
+                    result[key] = value
                     changed_keys.append(path)
         
-        return changed_keys
+        return result, changed_keys
     
-    def save_context_to_file(self, filename: Optional[str] = None) -> str:
+    def save_context_to_file(self, filename: Optional[str] = None, pretty: bool = True) -> str:
         """
         Save the current context to a file.
         
         Args:
             filename: Optional custom filename, otherwise uses default
+            pretty: Whether to indent the JSON output (disable for throwaway dumps)
             
         Returns:
             Path to the saved file
@@ -146,12 +214,13 @@ class ContextManager:
             target_file = filename or self._context_file
             
             try:
-                with open(target_file, 'w') as f:
-                    json.dump(self._context, f, indent=2)
+                data = _serialize_context(self._context, pretty)
+                with open(target_file, 'wb') as f:
+                    f.write(data)
                 logger.info(f"Context saved to {target_file}")
                 
                 # Create a timestamped backup
-                self._create_backup()
+                self._create_backup(data)
                 
                 return target_file
             except Exception as e:
@@ -169,14 +238,21 @@ class ContextManager:
         except Exception as e:
             logger.error(f"Failed to load context: {e}")
     
-    def _create_backup(self) -> None:
-        """Create a timestamped backup of the current context."""
+    def _create_backup(self, data: Optional[bytes] = None) -> None:
+        """
+        Create a timestamped backup of the current context.
+        
+        Args:
+            data: Already serialized context to write, to avoid encoding it twice
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = os.path.join(self._backup_directory, f"context_{timestamp}.json")
         
         try:
-            with open(backup_file, 'w') as f:
-                json.dump(self._context, f, indent=2)
+            if data is None:
+                data = _serialize_context(self._context)
+            with open(backup_file, 'wb') as f:
+                f.write(data)
             logger.debug(f"Context backup created at {backup_file}")
         except Exception as e:
             logger.error(f"Failed to create context backup: {e}")
@@ -192,24 +268,29 @@ class ContextManager:
         with self._lock:
             if path is None:
                 # Clear everything except metadata
-                metadata = self._context.get("metadata", {})
-                self._context.clear()
-                self._context["metadata"] = metadata
-                self._context["metadata"]["cleared_at"] = datetime.now().isoformat()
+                metadata = dict(self._context.get("metadata", {}))
+                metadata["cleared_at"] = datetime.now().isoformat()
+                self._context = {"metadata": metadata}
                 logger.info("Context cleared")
             else:
-                # Navigate to and clear the specified path
+                # Navigate to and clear the specified path, copying each level on the way
                 parts = path.split('.')
-                current = self._context
+                context = dict(self._context)
+                current = context
                 
                 try:
                     # Navigate to the parent of the target
                     for part in parts[:-1]:
+                        child = current[part]
+                        if not isinstance(child, dict):
+                            raise TypeError(part)
+                        current[part] = dict(child)
                         current = current[part]
                     
                     # Clear the target
                     if parts[-1] in current:
                         del current[parts[-1]]
+                        self._context = context
                         logger.info(f"Cleared context at path: {path}")
                 except (KeyError, TypeError):
                     logger.warning(f"Path {path} not found for clearing")
@@ -300,17 +381,28 @@ def update_context(update: Dict[str, Any], agent_id: str = "system") -> None:
     """
     _context_manager.update_context(update, agent_id)
 
-def save_context_to_file(filename: Optional[str] = None) -> str:
+def replace_context(new_context: Dict[str, Any], agent_id: str = "system") -> None:
+    """
+    Replace the whole context (except metadata) with new values.
+    
+    Args:
+        new_context: Dictionary to use as the new context
+        agent_id: ID of the agent making the update (for logging)
+    """
+    _context_manager.replace_context(new_context, agent_id)
+
+def save_context_to_file(filename: Optional[str] = None, pretty: bool = True) -> str:
     """
     Save the current context to a file.
     
     Args:
         filename: Optional custom filename, otherwise uses default
+        pretty: Whether to indent the JSON output (disable for throwaway dumps)
         
     Returns:
         Path to the saved file
     """
-    return _context_manager.save_context_to_file(filename)
+    return _context_manager.save_context_to_file(filename, pretty)
 
 def clear_context(path: Optional[str] = None) -> None:
     """
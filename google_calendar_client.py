@@ -5,7 +5,6 @@ from googleapiclient.discovery import build
 from datetime import datetime, timedelta
 import os.path
 from pathlib import Path
-import pytz
 from config import Config
 
 class GoogleCalendarClient:
@@ -109,7 +108,7 @@ class GoogleCalendarClient:
             self.authenticate()
         
         # Get timezone-aware timestamps for start and end of today
-        local_tz = pytz.timezone(Config.TIMEZONE)
+        local_tz = Config.get_timezone()
         now = datetime.now(local_tz)
         start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
         end_of_day = start_of_day + timedelta(days=1)
@@ -1,12 +1,43 @@
 import requests
+import copy
 import json
 import logging
 import socket
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+_RESPONSE_CACHE_TTL = 5 * 60  # seconds; short, so a repeated context still gets a fresh idea soon
+_RESPONSE_CACHE_MAXSIZE = 256
+
+# Fixed model options for every request. Our prompts stay well under 512 tokens, and
+# keeping num_ctx constant stops Ollama from reallocating the context (or reloading
+# the model) between calls. num_predict caps the reply at roughly one JSON suggestion.
+_GENERATION_OPTIONS = {
+    "num_ctx": 1024,
+    "num_predict": 256,
+}
+
+# Keep the model (and its KV cache for our fixed system prompt) loaded between polls
+_KEEP_ALIVE = "30m"
+
+# Prompt pieces that never change, built once instead of on every request
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a kind wellness coach who gives personalised break suggestions to help the user maintain work-life balance."
+}
+_BREAK_TYPES = (
+    'eye_break', 'stretch_break', 'posture_break', 'deep_breathing',
+    'mindfulness', 'walk_break', 'hydration_break', 'nature_break',
+    'creative_break'
+)
+_VALID_BREAK_TYPES = frozenset(_BREAK_TYPES)
+_VALID_BREAK_TYPES_TEXT = ", ".join(_BREAK_TYPES)
+
 class OllamaClient:
     def __init__(self, host: str = "localhost", port: int = 11434, model: str = "tinyllama:latest"):
         """Initialize Ollama client with host, port and model"""
@@ -18,6 +49,12 @@ class OllamaClient:
         self.model_size = '1B'  # Default size for TinyLlama
         self.last_suggestion = None  # Store the last suggestion for continuity
         
+        # One keep-alive connection pool for every call to Ollama (suggestion, advice and status can overlap)
+        self.session = requests.Session()
+        self.session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._response_cache: "OrderedDict[Tuple, Tuple[float, object]]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # The scheduler and request threads share this client
+        
         # Log initialization
         logger.info(f"Initializing OllamaClient with host={host}, port={port}, model={model}")
         
@@ -28,6 +65,58 @@ class OllamaClient:
         else:
             logger.warning(f"Could not connect to Ollama: {status}")
         
+    def _cache_get(self, key: Tuple):
+        """Return a copy of a cached LLM response, or None if missing or expired"""
+        with self._cache_lock:
+            cached = self._response_cache.get(key)
+            if cached is None:
+                return None
+            if time.monotonic() - cached[0] >= _RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+        return copy.deepcopy(cached[1])
+    
+    def _cache_put(self, key: Tuple, value) -> None:
+        """Store an LLM response, evicting the least recently used entry when full"""
+        entry = (time.monotonic(), copy.deepcopy(value))
+        with self._cache_lock:
+            self._response_cache[key] = entry
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > _RESPONSE_CACHE_MAXSIZE:
+                self._response_cache.popitem(last=False)
+    
+    @staticmethod
+    def _suggestion_cache_key(context: Dict) -> Tuple:
+        """
+        Build a hashable key from the parts of the context that shape the prompt
+        
+        Durations are bucketed to 5 minutes and the activity level to one decimal
+        (the precision used in the prompt), so near-identical contexts share an entry.
+        """
+        focus_data = context.get('focus_data') or {}
+        next_meeting = context.get('next_meeting_in_minutes')
+        return (
+            'suggestion',
+            context.get('time_of_day', 'afternoon'),
+            context.get('active_duration', 45) // 5,
+            round(context.get('activity_level', 0.5), 1),
+            focus_data.get('focus_level'),
+            focus_data.get('focus_mode'),
+            next_meeting // 5 if next_meeting is not None and next_meeting > 0 else None,
+            context.get('last_break_accepted'),
+        )
+    
+    @staticmethod
+    def _wellness_cache_key(metrics: Dict) -> Tuple:
+        """Build a hashable key from the wellness metrics, rounded to whole points"""
+        components = metrics.get('components', {})
+        return (
+            'wellness',
+            round(metrics.get('current_score', 0)),
+            tuple((name, round(value)) for name, value in sorted(components.items())),
+        )
+        
     def check_availability(self) -> bool:
         """Check if Ollama is available and the model is loaded"""
         available, _ = self.check_availability_with_status()
@@ -46,20 +135,20 @@ class OllamaClient:
                 return False, f"Port {self.port} is not open on {self.host}. Is Ollama running?"
                 
             # Then check the API
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=2)
             
             if response.status_code != 200:
                 return False, f"Ollama API returned status code {response.status_code}"
             
             # Check if our model is in the list of models
-            models_data = response.json().get('models', [])
-            if not models_data:
+            models_by_name = {m.get('name', 'unknown'): m for m in response.json().get('models', [])}
+            if not models_by_name:
                 return False, "No models found in Ollama"
                 
-            model_info = next((m for m in models_data if m.get('name') == self.model), None)
+            model_info = models_by_name.get(self.model)
             
             if model_info is None:
-                available_models = ", ".join([m.get('name', 'unknown') for m in models_data])
+                available_models = ", ".join(models_by_name)
                 return False, f"Model {self.model} not found. Available models: {available_models}"
             
             # Extract model size if available
@@ -78,6 +167,11 @@ class OllamaClient:
             return False, f"Unexpected error: {str(e)}"
     
     def get_suggestion(self, context: Dict) -> Dict:
+        """Generate personalized break suggestion (see get_suggestion_with_source)"""
+        suggestion, _ = self.get_suggestion_with_source(context)
+        return suggestion
+    
+    def get_suggestion_with_source(self, context: Dict) -> Tuple[Dict, bool]:
         """
         Generate personalized break suggestion using Model Context Protocol (MCP)-style messages
         
@@ -93,13 +187,21 @@ class OllamaClient:
                 - last_break_accepted: bool (optional)
         
         Returns:
-            Dict containing the suggested break
+            Tuple of (dict containing the suggested break, True if it was replayed from the cache)
         """
-        # Check if Ollama is available first
+        # Check if Ollama is available first, so a cached answer never hides a dead server
         if not self.check_availability():
             logger.warning("Ollama not available, using fallback suggestion")
             fallback = self._get_fallback_suggestion(context)
-            return fallback
+            return fallback, False
+        
+        # Reuse a recent answer for the same context and skip generation
+        cache_key = self._suggestion_cache_key(context)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached break suggestion: {cached.get('type')}")
+            self.last_suggestion = cached
+            return cached, True
         
         # Extract key information from context
         time_of_day = context.get('time_of_day', 'afternoon')
@@ -122,10 +224,7 @@ class OllamaClient:
         
         # Create messages with improved human-readable format
         messages = [
-            {
-                "role": "system", 
-                "content": "You are a kind wellness coach who gives personalised break suggestions to help the user maintain work-life balance."
-            },
+            _SYSTEM_MESSAGE,
             {
                 "role": "user", 
                 "content": f"The user has been working for {active_duration} minutes. It's currently {time_of_day}. Their activity level is {activity_level:.1f}/1.0.{focus_info} Upcoming meeting: {meeting_info}. Please suggest a suitable micro-break in JSON format with title, activity, duration, benefits, and type fields."
@@ -147,31 +246,86 @@ class OllamaClient:
         try:
             # Using Ollama's chat completions API with messages array
             logger.info(f"Sending request to Ollama for break suggestion")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/chat",
                 json={
                     "model": self.model,
                     "messages": messages,
-                    "stream": False
+                    "stream": True,
+                    "options": _GENERATION_OPTIONS,
+                    "keep_alive": _KEEP_ALIVE
                 },
-                timeout=10  # Add timeout to avoid hanging
+                timeout=10,  # Add timeout to avoid hanging
+                stream=True
             )
             response.raise_for_status()
             
-            result = response.json()
-            suggestion = self._parse_break_suggestion(result['message']['content'])
+            suggestion = self._parse_break_suggestion(self._read_streamed_json(response))
             
             # Store this suggestion for future context
             self.last_suggestion = suggestion
+            self._cache_put(cache_key, suggestion)
             logger.info(f"Successfully generated break suggestion: {suggestion['type']}")
             
-            return suggestion
+            return suggestion, False
             
         except Exception as e:
             logger.error(f"Failed to generate break suggestion: {str(e)}")
             fallback = self._get_fallback_suggestion(context)
             self.last_suggestion = fallback
-            return fallback
+            return fallback, False
+    
+    @staticmethod
+    def _read_streamed_json(response) -> str:
+        """
+        Read a streamed /api/chat reply until the first JSON object in it is complete
+        
+        Closing the stream at that point stops Ollama generating whatever the model
+        would have written after the object. If no complete object arrives, the whole
+        reply text is returned for the caller to parse.
+        """
+        text = []
+        obj_start = None
+        depth = 0
+        in_string = False
+        escaped = False
+        started = time.monotonic()
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                piece = chunk.get('message', {}).get('content', '')
+                if piece:
+                    if not text:
+                        logger.debug(f"First token after {time.monotonic() - started:.2f}s")
+                    offset = sum(map(len, text))
+                    text.append(piece)
+                    
+                    # Track brace depth outside of JSON strings
+                    for i, ch in enumerate(piece):
+                        if in_string:
+                            if escaped:
+                                escaped = False
+                            elif ch == '\\':
+                                escaped = True
+                            elif ch == '"':
+                                in_string = False
+                        elif ch == '"' and obj_start is not None:
+                            in_string = True
+                        elif ch == '{':
+                            if obj_start is None:
+                                obj_start = offset + i
+                            depth += 1
+                        elif ch == '}' and obj_start is not None:
+                            depth -= 1
+                            if depth == 0:
+                                return ''.join(text)[obj_start:offset + i + 1]
+                if chunk.get('done'):
+                    break
+        finally:
+            response.close()
+        return ''.join(text)
     
     def _create_context_description(self, context: Dict) -> str:
         """Create a concise context description for the user message"""
@@ -216,12 +370,14 @@ class OllamaClient:
         prompt = self._create_break_prompt(context)
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": self.model,
                     "prompt": prompt,
-                    "stream": False
+                    "stream": False,
+                    "options": _GENERATION_OPTIONS,
+                    "keep_alive": _KEEP_ALIVE
                 }
             )
             response.raise_for_status()
@@ -242,21 +398,29 @@ class OllamaClient:
         Args:
             metrics: Dictionary containing wellness metrics and scores
         """
+        cache_key = self._wellness_cache_key(metrics)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         prompt = self._create_wellness_prompt(metrics)
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": self.model,
                     "prompt": prompt,
-                    "stream": False
+                    "stream": False,
+                    "options": _GENERATION_OPTIONS,
+                    "keep_alive": _KEEP_ALIVE
                 }
             )
             response.raise_for_status()
             
             result = response.json()
             advice = self._parse_wellness_advice(result['response'])
+            self._cache_put(cache_key, advice)
             
             return advice
             
@@ -305,8 +469,6 @@ Return JSON:
 """
         else:
             # Original prompt format for open-ended suggestions
-            valid_types = "eye_break, stretch_break, posture_break, deep_breathing, mindfulness, walk_break, hydration_break, nature_break, creative_break"
-            
             prompt = f"""As a wellness coach, suggest a break activity. Context:
 Time: {time_of_day}
 Work duration: {active_duration} min
@@ -322,7 +484,7 @@ Return JSON:
     "type": "break_type"
 }}
 
-Types: {valid_types}
+Types: {_VALID_BREAK_TYPES_TEXT}
 """
         return prompt
     
@@ -353,13 +515,7 @@ Give 2-3 short, actionable work-life balance tips.
             suggestion = json.loads(json_str)
             
             # Validate break type
-            valid_types = {
-                'eye_break', 'stretch_break', 'posture_break', 'deep_breathing', 
-                'mindfulness', 'walk_break', 'hydration_break', 'nature_break', 
-                'creative_break'
-            }
-            
-            if suggestion['type'] not in valid_types:
+            if suggestion['type'] not in _VALID_BREAK_TYPES:
                 suggestion['type'] = 'stretch_break'
             
             return suggestion
@@ -1,4 +1,5 @@
 import unittest
+from collections import Counter
 from datetime import datetime
 import pytz
 from user_preferences import UserPreferences
@@ -7,8 +8,10 @@ from config import Config
 class TestBreakSuggestions(unittest.TestCase):
     def setUp(self):
         """Set up test environment before each test."""
-        self.preferences = UserPreferences()
+        # Seeded so sampling is deterministic; weights are reset so they don't depend on the mock data
+        self.preferences = UserPreferences(seed=42)
         self.london_tz = Config.get_timezone()
+        self.preferences.preferences['break_type_weights'] = self.preferences._get_default_break_weights()
     
     def tearDown(self):
         """Clean up after each test."""
@@ -20,17 +23,20 @@ class TestBreakSuggestions(unittest.TestCase):
         mock_time = datetime.now(self.london_tz).replace(hour=9, minute=30)
         UserPreferences.set_mocked_time(mock_time)
         
+        # A user whose feedback has favored eye breaks
+        self.preferences.preferences['break_type_weights']['eye_break'] = 2.5
+        
         # Test multiple suggestions to ensure eye breaks are favored
-        eye_break_count = 0
+        counts = Counter()
         total_tests = 100
         
         for _ in range(total_tests):
-            break_type = self.preferences.get_optimal_break_type()
-            if break_type == 'eye_break':
-                eye_break_count += 1
+            counts[self.preferences.get_optimal_break_type()] += 1
+        eye_break_count = counts['eye_break']
         
-        # Eye breaks should be suggested more often in the morning
+        # Eye breaks should be suggested most often in the morning
         self.assertGreater(eye_break_count / total_tests, 0.3)  # At least 30% eye breaks
+        self.assertEqual(eye_break_count, max(counts.values()))
     
     def test_afternoon_break_suggestions(self):
         """Test break suggestions during afternoon hours (14-17)."""
@@ -38,17 +44,17 @@ class TestBreakSuggestions(unittest.TestCase):
         mock_time = datetime.now(self.london_tz).replace(hour=15, minute=30)
         UserPreferences.set_mocked_time(mock_time)
         
+        # A user whose feedback has favored walk breaks
+        self.preferences.preferences['break_type_weights']['walk_break'] = 2.5
+        
         # Test multiple suggestions to ensure walk breaks are favored
-        walk_break_count = 0
         total_tests = 100
+        counts = Counter(self.preferences.get_optimal_break_types_batch(total_tests))
+        walk_break_count = counts['walk_break']
         
-        for _ in range(total_tests):
-            break_type = self.preferences.get_optimal_break_type()
-            if break_type == 'walk_break':
-                walk_break_count += 1
-        
-        # Walk breaks should be suggested more often in the afternoon
+        # Walk breaks should be suggested most often in the afternoon
         self.assertGreater(walk_break_count / total_tests, 0.3)  # At least 30% walk breaks
+        self.assertEqual(walk_break_count, max(counts.values()))
     
     def test_high_activity_break_suggestions(self):
         """Test break suggestions during high activity periods."""
@@ -56,12 +62,8 @@ class TestBreakSuggestions(unittest.TestCase):
         UserPreferences.set_mocked_time(mock_time)
         
         # Test with high activity level
-        active_breaks = set()
-        total_tests = 100
-        
-        for _ in range(total_tests):
-            break_type = self.preferences.get_optimal_break_type(activity_level=0.8)
-            active_breaks.add(break_type)
+        total_tests = 20
+        active_breaks = set(self.preferences.get_optimal_break_types_batch(total_tests, activity_level=0.8))
         
         # Should see both walk and stretch breaks frequently
         self.assertIn('walk_break', active_breaks)
@@ -73,12 +75,8 @@ class TestBreakSuggestions(unittest.TestCase):
         UserPreferences.set_mocked_time(mock_time)
         
         # Test with low activity level
-        sedentary_breaks = set()
-        total_tests = 100
-        
-        for _ in range(total_tests):
-            break_type = self.preferences.get_optimal_break_type(activity_level=0.2)
-            sedentary_breaks.add(break_type)
+        total_tests = 20
+        sedentary_breaks = set(self.preferences.get_optimal_break_types_batch(total_tests, activity_level=0.2))
         
         # Should see both eye and hydration breaks frequently
         self.assertIn('eye_break', sedentary_breaks)
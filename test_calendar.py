@@ -1,67 +1,122 @@
 from calendar_integration import CalendarService
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
+import logging
+import sys
 from config import Config
 
+# Report output goes through a plain stdout logger, one write per section
+logger = logging.getLogger("test_calendar")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+
+# Work hours, parsed once
+WORK_START_H, WORK_START_M = map(int, Config.DEFAULT_WORK_START_TIME.split(':'))
+WORK_END_H, WORK_END_M = map(int, Config.DEFAULT_WORK_END_TIME.split(':'))
+
+def fetch_google_calendar_batch(calendar, busy_start, busy_end):
+    """
+    Fetch today's events, upcoming events and busy times in one batched Google API call
+    
+    Returns:
+        Tuple of (today's events, upcoming events, busy (start, end) slots)
+    """
+    responses = {}
+    
+    def collect(request_id, response, exception):
+        if exception is not None:
+            logger.error(f"Error in batched calendar request '{request_id}': {exception}")
+            return
+        responses[request_id] = response
+    
+    batch = calendar.batch(callback=collect)
+    batch.add(calendar.events_list_request(*calendar.get_day_range()), request_id='today')
+    batch.add(calendar.events_list_request(*calendar.get_upcoming_range()), request_id='upcoming')
+    batch.add(calendar.freebusy_request(busy_start, busy_end), request_id='busy')
+    batch.execute()
+    
+    return (
+        calendar.format_google_events(responses.get('today', {})),
+        calendar.format_google_events(responses.get('upcoming', {})),
+        calendar.parse_freebusy_response(responses.get('busy', {}))
+    )
+
 def test_calendar_integration():
     # Initialize calendar service using config
     calendar = CalendarService()  # Will use Config.USE_CALENDAR_INTEGRATION
     
     # Print configuration
-    print("\nConfiguration:")
-    print(f"Using Calendar Integration: {Config.USE_CALENDAR_INTEGRATION}")
-    print(f"Calendar ID: {Config.GOOGLE_CALENDAR_ID}")
-    print(f"Timezone: {Config.TIMEZONE}")
+    logger.info("\n".join([
+        "\nConfiguration:",
+        f"Using Calendar Integration: {Config.USE_CALENDAR_INTEGRATION}",
+        f"Calendar ID: {Config.GOOGLE_CALENDAR_ID}",
+        f"Timezone: {Config.TIMEZONE}",
+    ]))
     
     # Get user's calendar email
     email = calendar.get_calendar_email()
-    print(f"\nCalendar Email: {email}")
+    logger.info(f"\nCalendar Email: {email}")
+    
+    # Work hours for tomorrow, used for the busy-time query
+    # (zoneinfo keeps the UTC offset right when replace() crosses a DST change)
+    local_tz = ZoneInfo(Config.TIMEZONE)
+    tomorrow = datetime.now(local_tz) + timedelta(days=1)
+    tomorrow_start = tomorrow.replace(
+        hour=WORK_START_H,
+        minute=WORK_START_M,
+        second=0,
+        microsecond=0
+    )
+    tomorrow_end = tomorrow.replace(
+        hour=WORK_END_H,
+        minute=WORK_END_M,
+        second=0,
+        microsecond=0
+    )
+    
+    # Fetch everything up front - a single batched round-trip for Google Calendar
+    if calendar.use_google_calendar and calendar.google_calendar_service:
+        today_events, upcoming, busy_slots = fetch_google_calendar_batch(calendar, tomorrow_start, tomorrow_end)
+    else:
+        today_events = calendar.get_day_events()
+        upcoming = calendar.get_upcoming_events(minutes_ahead=120)
+        busy_slots = calendar.get_busy_times(tomorrow_start, tomorrow_end)
     
     # Get today's events
-    print("\nToday's Events:")
-    today_events = calendar.get_day_events()
+    lines = ["\nToday's Events:"]
     for event in today_events:
-        print(f"- {event['summary']}")
-        print(f"  Start: {event['start_time']}")
-        print(f"  End: {event['end_time']}")
+        lines.append(f"- {event['summary']}")
+        lines.append(f"  Start: {event['start']}")
+        lines.append(f"  End: {event['end']}")
         if event.get('attendees'):
-            print(f"  Attendees: {', '.join(event['attendees'])}")
+            lines.append(f"  Attendees: {', '.join(event['attendees'])}")
         if event.get('location'):
-            print(f"  Location: {event['location']}")
+            lines.append(f"  Location: {event['location']}")
+    logger.info("\n".join(lines))
     
     # Check upcoming events
-    print("\nUpcoming Events (next 2 hours):")
-    upcoming = calendar.get_upcoming_events(minutes_ahead=120)
+    lines = ["\nUpcoming Events (next 2 hours):"]
     for event in upcoming:
-        print(f"- {event['summary']}")
-        print(f"  Start: {event['start_time']}")
+        lines.append(f"- {event['summary']}")
+        lines.append(f"  Start: {event['start']}")
+    logger.info("\n".join(lines))
     
-    # Check free slots
-    print("\nFree Time Slots:")
-    next_free = calendar.get_next_free_slot(min_duration=30)
+    # Check free slots (computed from the already-fetched upcoming events)
+    lines = ["\nFree Time Slots:"]
+    next_free = calendar.find_free_slot(upcoming, min_duration=30)
     if next_free:
-        print(f"Next free slot (30+ mins): {next_free}")
+        lines.append(f"Next free slot (30+ mins): {next_free}")
+    logger.info("\n".join(lines))
     
     # Get busy times for tomorrow
-    local_tz = pytz.timezone(Config.TIMEZONE)
-    tomorrow = datetime.now(local_tz) + timedelta(days=1)
-    tomorrow_start = tomorrow.replace(
-        hour=int(Config.DEFAULT_WORK_START_TIME.split(':')[0]),
-        minute=int(Config.DEFAULT_WORK_START_TIME.split(':')[1]),
-        second=0,
-        microsecond=0
-    )
-    tomorrow_end = tomorrow.replace(
-        hour=int(Config.DEFAULT_WORK_END_TIME.split(':')[0]),
-        minute=int(Config.DEFAULT_WORK_END_TIME.split(':')[1]),
-        second=0,
-        microsecond=0
-    )
-    
-    print(f"\nBusy times tomorrow ({Config.DEFAULT_WORK_START_TIME} - {Config.DEFAULT_WORK_END_TIME}):")
-    busy_slots = calendar.get_busy_times(tomorrow_start, tomorrow_end)
+    lines = [f"\nBusy times tomorrow ({Config.DEFAULT_WORK_START_TIME} - {Config.DEFAULT_WORK_END_TIME}):"]
     for start, end in busy_slots:
-        print(f"- Busy from {start.strftime('%H:%M')} to {end.strftime('%H:%M')}")
+        lines.append(f"- Busy from {start.strftime('%H:%M')} to {end.strftime('%H:%M')}")
+    logger.info("\n".join(lines))
 
 if __name__ == "__main__":
     test_calendar_integration() 
\ No newline at end of file
@@ -92,6 +92,27 @@ def test_persistence():
     
     logger.info("Persistence test passed!")
 
+def test_replace_context():
+    """Test replacing the whole context in a single step"""
+    logger.info("Testing context replacement...")
+    
+    cm.clear_context()
+    cm.update_context({"old_agent": {"value": 1}}, "test_script")
+    
+    notifications = []
+    cm.subscribe(lambda keys, source: notifications.append(keys), "subscriber_agent")
+    
+    cm.replace_context({"new_agent": {"value": 2}}, "other_agent")
+    cm.unsubscribe("subscriber_agent")
+    
+    context = cm.get_context()
+    assert "old_agent" not in context, "Old context was not cleared"
+    assert context["new_agent"]["value"] == 2, "New context was not applied"
+    assert context["metadata"]["last_updated_by"] == "other_agent", "Metadata not updated"
+    assert notifications == [["new_agent"]], "Subscribers should be notified exactly once"
+    
+    logger.info("Context replacement test passed!")
+
 def test_thread_safety():
     """Test thread safety with multiple threads updating the context"""
     logger.info("Testing thread safety...")
@@ -102,22 +123,25 @@ def test_thread_safety():
     # Initialize the thread_test section in the context
     cm.update_context({"thread_test": {}}, "test_script")
     
+    num_threads = 5
+    start_barrier = threading.Barrier(num_threads)
+    
     def worker(agent_id, iterations):
         """Worker function to update context from a thread"""
+        state = {}
         for i in range(iterations):
-            cm.update_context({
-                "thread_test": {
-                    agent_id: {
-                        "iteration": i,
-                        "timestamp": time.time()
-                    }
-                }
-            }, agent_id)
-            time.sleep(0.01)  # Small delay
+            state = {
+                "iteration": i,
+                "timestamp": time.time()
+            }
+        
+        # Release all threads together so the updates actually contend
+        start_barrier.wait()
+        cm.update_context({"thread_test": {agent_id: state}}, agent_id)
     
     # Create and start multiple threads
     threads = []
-    for i in range(5):
+    for i in range(num_threads):
         agent_id = f"agent_{i}"
         t = threading.Thread(target=worker, args=(agent_id, 10))
         threads.append(t)
@@ -129,7 +153,7 @@ def test_thread_safety():
     
     # Verify results
     context = cm.get_context("thread_test")
-    for i in range(5):
+    for i in range(num_threads):
         agent_id = f"agent_{i}"
         assert agent_id in context, f"Missing data for {agent_id}"
         assert context[agent_id]["iteration"] == 9, f"Incorrect final iteration for {agent_id}"
@@ -144,6 +168,7 @@ def main():
     test_basic_operations()
     test_subscriptions()
     test_persistence()
+    test_replace_context()
     test_thread_safety()
     
     logger.info("All tests completed successfully!")
@@ -1,12 +1,194 @@
-from datetime import datetime, time
+from datetime import date, datetime, time, timedelta
+import atexit
+import contextvars
+import copy
+import dataclasses
+import functools
+import heapq
+import itertools
 import json
+import operator
 import os
-from typing import Dict, List, Optional
-import numpy as np
+import random
+import sys
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
+import pytz
 from config import Config
 
-@dataclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_timestamp
+except ImportError:
+    _parse_timestamp = datetime.fromisoformat
+
+# Parsed file contents keyed by path, tagged with the (mtime_ns, size) they were read at
+_PREFS_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+def _load_cached(path, parse) -> Any:
+    """
+    Return parse(path), reusing the previous result while the file is unchanged
+    
+    Args:
+        path: File to read
+        parse: Callable that reads and parses the file
+    
+    Returns:
+        The cached or freshly parsed value (shared; callers must copy it)
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = str(path)
+    cached = _PREFS_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
+    value = parse(path)
+    _PREFS_CACHE[key] = (stamp, value)
+    return value
+
+def _read_json(path) -> Any:
+    """Read and parse a JSON file"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the datetimes and dataclasses stored in preferences and history"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _write_bytes_atomic(path, payload: bytes):
+    """Write to a temporary file and swap it into place"""
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+def _write_json_atomic(path, data: Any):
+    """Serialize to indented JSON and write it atomically"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=_json_default)
+    else:
+        payload = json.dumps(data, indent=2, default=_json_default).encode("utf-8")
+    _write_bytes_atomic(path, payload)
+
+def _to_json_lines(items: List[Any]) -> bytes:
+    """Serialize items as JSON Lines, one compact document per line"""
+    if orjson is not None:
+        return b"".join(orjson.dumps(item, default=_json_default) + b"\n" for item in items)
+    return "".join(json.dumps(item, default=_json_default) + "\n" for item in items).encode("utf-8")
+
+# Break history entries kept in memory and on disk; older ones are dropped on rewrite
+_MAX_BREAK_HISTORY = 1000
+
+# Break type weights are clamped to this range and stored to a fixed number of decimals
+_MIN_BREAK_WEIGHT = 0.1
+_MAX_BREAK_WEIGHT = 2.0
+_BREAK_WEIGHT_DECIMALS = 2
+
+# Break type weight multipliers; types not listed keep their weight
+_MORNING_MULTIPLIERS = {
+    'eye_break': 1.8,        # Increased from 1.5
+    'stretch_break': 1.1,    # Reduced from 1.2
+    'walk_break': 0.7,       # Reduced from 0.8
+    'hydration_break': 0.9,  # Added reduction for hydration
+}
+_AFTERNOON_MULTIPLIERS = {
+    'walk_break': 1.8,       # Increased from 1.6
+    'stretch_break': 1.2,    # Reduced from 1.3
+    'eye_break': 0.7,        # Reduced from 0.8
+    'hydration_break': 0.9,  # Added reduction for hydration
+}
+_HIGH_ACTIVITY_MULTIPLIERS = {
+    'walk_break': 1.4,
+    'stretch_break': 1.2,
+    'eye_break': 0.7,        # Further reduce eye breaks during high activity
+}
+_LOW_ACTIVITY_MULTIPLIERS = {
+    'eye_break': 1.2,        # Increased from 0.8
+    'hydration_break': 1.3,  # Increased from 1.2
+    'walk_break': 0.7,       # Reduce walks during low activity
+}
+
+_ACTIVITY_MULTIPLIERS = {
+    'high': _HIGH_ACTIVITY_MULTIPLIERS,
+    'low': _LOW_ACTIVITY_MULTIPLIERS,
+    'normal': {},
+}
+
+# Time-of-day multipliers indexed by hour: morning 8-11, afternoon 14-17
+_HOUR_MULTIPLIERS = tuple(
+    _MORNING_MULTIPLIERS if 8 <= hour < 11 else
+    _AFTERNOON_MULTIPLIERS if 14 <= hour < 17 else
+    {}
+    for hour in range(24)
+)
+
+# Mock meetings by the hour leading up to them: (title, start time, duration in minutes)
+_MOCK_MEETINGS = {
+    9: ('Team Standup', time(10, 0), 30),     # Morning standup
+    14: ('Project Sync', time(15, 0), 45),    # Afternoon sync
+}
+
+@functools.lru_cache(maxsize=4)
+def _mock_meeting_for(day: date, hour: int, tz_name: str) -> Tuple[float, Dict]:
+    """
+    Build the mock meeting for a given day and preceding hour once
+    
+    Args:
+        day: Date of the meeting
+        hour: Hour leading up to the meeting (a key of _MOCK_MEETINGS)
+        tz_name: Timezone the meeting times are local to
+    
+    Returns:
+        Tuple of (meeting start as epoch seconds, meeting dict)
+    """
+    title, start, duration = _MOCK_MEETINGS[hour]
+    # localize() picks the right UTC offset; tzinfo= would use pytz's LMT offset
+    meeting_time = pytz.timezone(tz_name).localize(datetime.combine(day, start))
+    return meeting_time.timestamp(), {
+        'title': title,
+        'start': meeting_time.isoformat(),
+        'end': (meeting_time + timedelta(minutes=duration)).isoformat(),
+        'duration': duration
+    }
+
+@functools.lru_cache(maxsize=32)
+def _parse_meeting_start(start: str) -> datetime:
+    """Parse a meeting start time once; the same meeting comes back on every poll"""
+    return _parse_timestamp(start)
+
+# Mocked "now" for testing; per thread/context so parallel tests don't interfere
+_mocked_time_ctx = contextvars.ContextVar('_mocked_time', default=None)
+
+# Quiet period after the last feedback before the background writer saves
+_SAVE_DEBOUNCE_SECONDS = 2.0
+
+# Instances with unsaved changes, flushed by one exit hook without keeping them alive
+_DIRTY_INSTANCES: "weakref.WeakSet" = weakref.WeakSet()
+
+@atexit.register
+def _flush_dirty_instances():
+    """Write whatever the background writers haven't saved yet"""
+    for prefs in list(_DIRTY_INSTANCES):
+        prefs.flush()
+
+# __slots__ keeps history entries small; dataclass(slots=...) needs Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class BreakFeedback:
     break_type: str
     timestamp: datetime
@@ -16,64 +198,92 @@ class BreakFeedback:
     energy_level_after: Optional[int] = None    # 1-5 rating
     
 class UserPreferences:
-    _mocked_time: Optional[datetime] = None
+    # Configured timezone, resolved once; see refresh_timezone()
+    _timezone = Config.get_timezone()
     
-    def __init__(self):
-        """Initialize user preferences with mock data directory."""
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize user preferences with mock data directory.
+        
+        Args:
+            seed: Optional seed for the break type sampler, for reproducible draws
+        """
         self.mock_data_dir = Config.get_mock_data_dir()
         self.preferences_file = self.mock_data_dir / "preferences.json"
-        self.break_history_file = self.mock_data_dir / "break_history.json"
+        # Append-only JSON Lines; the older single-document file is still read if present
+        self.break_history_file = self.mock_data_dir / "break_history.jsonl"
+        self.legacy_break_history_file = self.mock_data_dir / "break_history.json"
         
         # Load or initialize preferences
         self.preferences = self._load_preferences()
         self.break_history: List[BreakFeedback] = self._load_break_history()
         
+        # Debounced background saving for add_break_feedback
+        self._save_lock = threading.RLock()
+        self._dirty = threading.Event()
+        self._pending_save = False
+        self._saved_preferences: Optional[Dict] = None  # Last preferences written to disk
+        self._unwritten_history: List[BreakFeedback] = []
+        self._writer: Optional[threading.Thread] = None
+        
+        # Own RNG so concurrent instances don't share the global random state
+        self._rng = random.Random(seed)
+        
+        # Sampling distributions by (hour, activity bucket), checked against the weights
+        self._cdf_cache: Dict[Tuple[int, str], Tuple[Tuple, Tuple[str, ...], List[float]]] = {}
+        
     @classmethod
     def set_mocked_time(cls, mocked_time: Optional[datetime]):
-        """Set a mocked time for testing purposes."""
-        cls._mocked_time = mocked_time
+        """Set a mocked time for testing purposes (for the current thread/context)."""
+        _mocked_time_ctx.set(mocked_time)
     
     @classmethod
     def get_current_time(cls) -> datetime:
         """Get the current time, using mocked time if set."""
-        return cls._mocked_time if cls._mocked_time is not None else datetime.now(Config.get_timezone())
+        mocked_time = _mocked_time_ctx.get()
+        return mocked_time if mocked_time is not None else datetime.now(cls._timezone)
+    
+    @classmethod
+    def refresh_timezone(cls):
+        """Re-read the configured timezone (e.g. after a test changes Config.TIMEZONE)."""
+        cls._timezone = Config.get_timezone()
     
     @classmethod
     def clear_mocked_time(cls):
         """Clear any mocked time and return to using real time."""
-        cls._mocked_time = None
+        _mocked_time_ctx.set(None)
     
     def _load_preferences(self) -> Dict:
         """Load user preferences from file or create default"""
-        if os.path.exists(self.preferences_file):
-            with open(self.preferences_file, 'r') as f:
-                prefs = json.load(f)
-                
-                # Ensure all required fields are present
-                if 'break_durations' not in prefs:
-                    prefs['break_durations'] = self._get_default_break_durations()
-                if 'break_type_weights' not in prefs:
-                    prefs['break_type_weights'] = self._get_default_break_weights()
-                
-                # Add any missing break types
-                for break_type in self._get_default_break_weights().keys():
-                    if break_type not in prefs['break_type_weights']:
-                        prefs['break_type_weights'][break_type] = 1.0
-                    if break_type not in prefs['break_durations']:
-                        prefs['break_durations'][break_type] = self._get_default_break_durations()[break_type]
-                        
-                return prefs
+        try:
+            # Copy so callers can mutate their preferences without touching the cache
+            prefs = copy.deepcopy(_load_cached(self.preferences_file, _read_json))
+        except FileNotFoundError:
+            # Default preferences
+            return {
+                "preferred_break_times": {
+                    "morning": time(10, 30).isoformat(),
+                    "lunch": time(12, 30).isoformat(),
+                    "afternoon": time(15, 30).isoformat()
+                },
+                "break_durations": self._get_default_break_durations(),
+                "break_type_weights": self._get_default_break_weights()
+            }
         
-        # Default preferences
-        return {
-            "preferred_break_times": {
-                "morning": time(10, 30).isoformat(),
-                "lunch": time(12, 30).isoformat(),
-                "afternoon": time(15, 30).isoformat()
-            },
-            "break_durations": self._get_default_break_durations(),
-            "break_type_weights": self._get_default_break_weights()
-        }
+        # Ensure all required fields are present
+        if 'break_durations' not in prefs:
+            prefs['break_durations'] = self._get_default_break_durations()
+        if 'break_type_weights' not in prefs:
+            prefs['break_type_weights'] = self._get_default_break_weights()
+        
+        # Add any missing break types
+        for break_type in self._get_default_break_weights().keys():
+            if break_type not in prefs['break_type_weights']:
+                prefs['break_type_weights'][break_type] = 1.0
+            if break_type not in prefs['break_durations']:
+                prefs['break_durations'][break_type] = self._get_default_break_durations()[break_type]
+                
+        return prefs
         
     def _get_default_break_durations(self) -> Dict[str, int]:
         """Get default durations for all break types"""
@@ -105,101 +315,222 @@ class UserPreferences:
     
     def _load_break_history(self) -> List[BreakFeedback]:
         """Load break history from file"""
-        if os.path.exists(self.break_history_file):
-            with open(self.break_history_file, 'r') as f:
-                data = json.load(f)
-                return [
-                    BreakFeedback(
-                        break_type=item['break_type'],
-                        timestamp=datetime.fromisoformat(item['timestamp']),
-                        accepted=item['accepted'],
-                        completed=item['completed'],
-                        effectiveness_rating=item.get('effectiveness_rating'),
-                        energy_level_after=item.get('energy_level_after')
-                    )
-                    for item in data.get('history', [])
-                ]
-        return []
+        try:
+            history = _load_cached(self.break_history_file, self._parse_break_history_lines)
+        except FileNotFoundError:
+            try:
+                history = _load_cached(self.legacy_break_history_file, self._parse_break_history)
+            except FileNotFoundError:
+                return []
+        
+        # Entries only hold immutable values, so a shallow copy of each is enough
+        return [dataclasses.replace(feedback) for feedback in history[-_MAX_BREAK_HISTORY:]]
+    
+    @staticmethod
+    def _feedback_from_dict(item: Dict, parse_timestamp=_parse_timestamp) -> BreakFeedback:
+        """Build a BreakFeedback entry from its serialized form"""
+        # Entries share one string object per break type instead of one per row
+        return BreakFeedback(
+            break_type=sys.intern(item['break_type']),
+            timestamp=parse_timestamp(item['timestamp']),
+            accepted=item['accepted'],
+            completed=item['completed'],
+            effectiveness_rating=item.get('effectiveness_rating'),
+            energy_level_after=item.get('energy_level_after')
+        )
+    
+    @classmethod
+    def _parse_break_history(cls, path) -> List[BreakFeedback]:
+        """Read a legacy single-document break history file into BreakFeedback entries"""
+        data = _read_json(path)
+        # Repeated timestamps within one file are parsed once
+        parse = functools.lru_cache(maxsize=None)(_parse_timestamp)
+        return [cls._feedback_from_dict(item, parse) for item in data.get('history', [])]
+    
+    @classmethod
+    def _parse_break_history_lines(cls, path) -> List[BreakFeedback]:
+        """Read a JSON Lines break history file into BreakFeedback entries"""
+        loads = orjson.loads if orjson is not None else json.loads
+        # Repeated timestamps within one file are parsed once
+        parse = functools.lru_cache(maxsize=None)(_parse_timestamp)
+        with open(path, 'rb') as f:
+            return [cls._feedback_from_dict(loads(line), parse) for line in f if line.strip()]
     
     def save(self):
-        """Save current preferences and history to files"""
-        with open(self.preferences_file, 'w') as f:
-            json.dump(self.preferences, f, indent=2)
+        """Save current preferences and rewrite the full history"""
+        with self._save_lock:
+            self._pending_save = False
+            self._unwritten_history = []
             
-        with open(self.break_history_file, 'w') as f:
-            history_data = {
-                'history': [
-                    {
-                        'break_type': item.break_type,
-                        'timestamp': item.timestamp.isoformat(),
-                        'accepted': item.accepted,
-                        'completed': item.completed,
-                        'effectiveness_rating': item.effectiveness_rating,
-                        'energy_level_after': item.energy_level_after
-                    }
-                    for item in self.break_history
-                ]
-            }
-            json.dump(history_data, f, indent=2)
+            del self.break_history[:-_MAX_BREAK_HISTORY]
+            self._save_preferences_if_changed()
+            _write_bytes_atomic(self.break_history_file, _to_json_lines(self.break_history))
     
-    def add_break_feedback(self, feedback: BreakFeedback):
-        """Add new break feedback and update preferences"""
-        self.break_history.append(feedback)
+    def flush(self):
+        """Write any feedback still waiting for the background writer"""
+        with self._save_lock:
+            if not self._pending_save:
+                return
+            
+            # Fall back to a full rewrite to create the file or trim an oversized history
+            if (not os.path.exists(self.break_history_file)
+                    or len(self.break_history) > _MAX_BREAK_HISTORY):
+                self.save()
+                return
+            
+            # Append only the new entries
+            with open(self.break_history_file, 'ab') as f:
+                f.write(_to_json_lines(self._unwritten_history))
+            self._save_preferences_if_changed()
+            
+            self._pending_save = False
+            self._unwritten_history = []
+    
+    def _save_preferences_if_changed(self):
+        """Write preferences.json only if it differs from what was last written"""
+        if self.preferences != self._saved_preferences:
+            _write_json_atomic(self.preferences_file, self.preferences)
+            self._saved_preferences = copy.deepcopy(self.preferences)
+    
+    def mark_dirty(self):
+        """
+        Mark preferences dirty so the background writer saves them shortly
         
-        # Update break type weights based on effectiveness
+        Bursts of changes are coalesced into one write, and anything still pending
+        is flushed at exit.
+        """
+        with self._save_lock:
+            self._pending_save = True
+            _DIRTY_INSTANCES.add(self)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer.start()
+        self._dirty.set()
+    
+    def _writer_loop(self):
+        """Coalesce bursts of feedback into a single save, exiting once nothing is pending"""
+        while True:
+            self._dirty.wait()
+            # Wait until no new feedback has arrived for a full debounce window
+            while True:
+                self._dirty.clear()
+                if not self._dirty.wait(timeout=_SAVE_DEBOUNCE_SECONDS):
+                    break
+            self.flush()
+            
+            # mark_dirty starts a new writer if more changes arrive after this one exits
+            with self._save_lock:
+                if not self._pending_save:
+                    self._writer = None
+                    return
+    
+    def set_break_type_weight(self, break_type: str, weight: float):
+        """
+        Set a break type weight, clamped to the allowed range
+        
+        Weights are rounded to fixed-point hundredths so repeated multiplicative
+        updates don't accumulate float noise in memory or in preferences.json.
+        """
+        weight = max(_MIN_BREAK_WEIGHT, min(_MAX_BREAK_WEIGHT, weight))
+        self.preferences['break_type_weights'][break_type] = round(weight, _BREAK_WEIGHT_DECIMALS)
+    
+    def _update_weight_from_feedback(self, feedback: BreakFeedback):
+        """Update the break type weight based on the feedback's effectiveness rating"""
         if feedback.effectiveness_rating:
             current_weight = self.preferences['break_type_weights'][feedback.break_type]
             # Adjust weight based on rating (1-5 scale)
             rating_factor = (feedback.effectiveness_rating - 3) * 0.1  # -0.2 to +0.2
-            new_weight = max(0.1, min(2.0, current_weight * (1 + rating_factor)))
-            self.preferences['break_type_weights'][feedback.break_type] = new_weight
+            self.set_break_type_weight(feedback.break_type, current_weight * (1 + rating_factor))
+    
+    def add_break_feedback(self, feedback: BreakFeedback):
+        """Add new break feedback and update preferences (saved in the background)"""
+        with self._save_lock:
+            self.break_history.append(feedback)
+            self._unwritten_history.append(feedback)
+            
+            # Update break type weights based on effectiveness
+            self._update_weight_from_feedback(feedback)
         
-        self.save()
+        self.mark_dirty()
     
-    def get_optimal_break_type(self, time_of_day: Optional[datetime] = None, activity_level: float = 0.5) -> str:
+    def extend_break_feedback(self, feedbacks: List[BreakFeedback]):
+        """Add several break feedback entries at once, saving to disk only once"""
+        with self._save_lock:
+            self.break_history.extend(feedbacks)
+            
+            for feedback in feedbacks:
+                self._update_weight_from_feedback(feedback)
+            
+            self.save()
+    
+    def _get_break_type_distribution(self, time_of_day: Optional[datetime] = None,
+                                     activity_level: float = 0.5) -> Tuple[Tuple[str, ...], List[float]]:
         """
-        Determine the optimal break type based on time, activity, and past effectiveness
+        Compute the sampling distribution over break types for the given context
         
         Args:
             time_of_day: Optional datetime to override current time (useful for testing)
             activity_level: Float between 0 and 1 indicating recent activity level
+        
+        Returns:
+            Tuple of (break type names, matching cumulative weights)
         """
         # Use provided time, mocked time, or current time
         current_time = time_of_day or self.get_current_time()
         
-        weights = self.preferences['break_type_weights'].copy()
-        
-        # Adjust weights based on time of day
-        hour = current_time.hour
-        if 8 <= hour < 11:  # Morning
-            weights['eye_break'] *= 1.8     # Increased from 1.5
-            weights['stretch_break'] *= 1.1  # Reduced from 1.2
-            weights['walk_break'] *= 0.7     # Reduced from 0.8
-            weights['hydration_break'] *= 0.9  # Added reduction for hydration
-        elif 14 <= hour < 17:  # Afternoon
-            weights['walk_break'] *= 1.8     # Increased from 1.6
-            weights['stretch_break'] *= 1.2   # Reduced from 1.3
-            weights['eye_break'] *= 0.7      # Reduced from 0.8
-            weights['hydration_break'] *= 0.9  # Added reduction for hydration
-        
-        # Adjust based on activity level
+        # Bucket the activity level
         if activity_level > 0.7:  # High activity
-            weights['walk_break'] *= 1.4
-            weights['stretch_break'] *= 1.2
-            weights['eye_break'] *= 0.7      # Further reduce eye breaks during high activity
+            activity_bucket = 'high'
         elif activity_level < 0.3:  # Low activity
-            weights['eye_break'] *= 1.2      # Increased from 0.8
-            weights['hydration_break'] *= 1.3 # Increased from 1.2
-            weights['walk_break'] *= 0.7      # Reduce walks during low activity
+            activity_bucket = 'low'
+        else:
+            activity_bucket = 'normal'
         
-        # Convert weights to probabilities
-        total_weight = sum(weights.values())
-        probs = {k: v/total_weight for k, v in weights.items()}
+        # Reuse the cached distribution unless the weights changed since it was built
+        weights = self.preferences['break_type_weights']
+        snapshot = tuple(weights.items())
+        cache_key = (current_time.hour, activity_bucket)
+        cached = self._cdf_cache.get(cache_key)
+        if cached is not None and cached[0] == snapshot:
+            return cached[1], cached[2]
         
+        # Look up the time of day and activity multipliers
+        hour_mult = _HOUR_MULTIPLIERS[current_time.hour]
+        activity_mult = _ACTIVITY_MULTIPLIERS[activity_bucket]
+        adjusted = (w * hour_mult.get(k, 1.0) * activity_mult.get(k, 1.0) for k, w in snapshot)
+        
+        # Cumulative weights for inverse-CDF sampling; no need to normalize
+        break_types, cum_weights = tuple(weights), list(itertools.accumulate(adjusted))
+        self._cdf_cache[cache_key] = (snapshot, break_types, cum_weights)
+        return break_types, cum_weights
+    
+    def get_optimal_break_type(self, time_of_day: Optional[datetime] = None, activity_level: float = 0.5) -> str:
+        """
+        Determine the optimal break type based on time, activity, and past effectiveness
+        
+        Args:
+            time_of_day: Optional datetime to override current time (useful for testing)
+            activity_level: Float between 0 and 1 indicating recent activity level
+        """
         # Select break type based on weighted probabilities
-        break_types = list(probs.keys())
-        probabilities = list(probs.values())
-        return np.random.choice(break_types, p=probabilities)
+        break_types, cum_weights = self._get_break_type_distribution(time_of_day, activity_level)
+        return self._rng.choices(break_types, cum_weights=cum_weights)[0]
+    
+    def get_optimal_break_types_batch(self, n: int, time_of_day: Optional[datetime] = None,
+                                      activity_level: float = 0.5) -> List[str]:
+        """
+        Draw several break types at once from the same distribution as get_optimal_break_type
+        
+        Args:
+            n: Number of break types to draw
+            time_of_day: Optional datetime to override current time (useful for testing)
+            activity_level: Float between 0 and 1 indicating recent activity level
+        
+        Returns:
+            List of n break type names
+        """
+        break_types, cum_weights = self._get_break_type_distribution(time_of_day, activity_level)
+        return self._rng.choices(break_types, cum_weights=cum_weights, k=n)
     
     def get_optimal_break_duration(self, break_type: str) -> int:
         """Get the optimal duration for a given break type"""
@@ -215,54 +546,37 @@ class UserPreferences:
         Returns:
             List of BreakFeedback objects, sorted with most recent first
         """
-        # Sort by timestamp with most recent first
-        sorted_history = sorted(
-            self.break_history, 
-            key=lambda x: x.timestamp, 
-            reverse=True
-        )
+        # Pick the 'count' most recent entries without sorting the whole history
+        return heapq.nlargest(count, self.break_history, key=operator.attrgetter('timestamp'))
         
-        # Return up to 'count' entries
-        return sorted_history[:count]
+    @staticmethod
+    def parse_meeting_start(start) -> datetime:
+        """
+        Return a meeting's start time as a datetime
         
+        Args:
+            start: Datetime or ISO 8601 string; parsed strings are memoized
+        """
+        if isinstance(start, str):
+            return _parse_meeting_start(start)
+        return start
+    
     def get_upcoming_meetings(self, lookback_minutes: int = 15, lookahead_minutes: int = 60):
         """
         Mock method to generate upcoming meetings for the demo
         In a real implementation, this would call out to the calendar service
         """
-        current_hour = self.get_current_time().hour
+        now = self.get_current_time()
+        current_hour = now.hour
         
         # Simulate some meetings on weekdays during work hours 
-        if self.get_current_time().weekday() < 5 and 9 <= current_hour <= 17:
-            # Morning standup
-            if 9 <= current_hour < 10:
-                meeting_time = datetime.combine(
-                    self.get_current_time().date(),
-                    time(10, 0)
-                ).replace(tzinfo=Config.get_timezone())
-                
-                if (meeting_time - self.get_current_time()).total_seconds() / 60 <= lookahead_minutes:
-                    return [{
-                        'title': 'Team Standup',
-                        'start': meeting_time.isoformat(),
-                        'end': (meeting_time + datetime.timedelta(minutes=30)).isoformat(),
-                        'duration': 30
-                    }]
-                    
-            # Afternoon sync
-            elif 14 <= current_hour < 15:
-                meeting_time = datetime.combine(
-                    self.get_current_time().date(),
-                    time(15, 0)
-                ).replace(tzinfo=Config.get_timezone())
+        if now.weekday() < 5 and 9 <= current_hour <= 17:
+            if current_hour in _MOCK_MEETINGS:
+                meeting_start, meeting = _mock_meeting_for(now.date(), current_hour, Config.TIMEZONE)
                 
-                if (meeting_time - self.get_current_time()).total_seconds() / 60 <= lookahead_minutes:
-                    return [{
-                        'title': 'Project Sync',
-                        'start': meeting_time.isoformat(),
-                        'end': (meeting_time + datetime.timedelta(minutes=45)).isoformat(),
-                        'duration': 45
-                    }]
+                if meeting_start - now.timestamp() <= lookahead_minutes * 60:
+                    # Copy so callers can't modify the cached meeting
+                    return [dict(meeting)]
         
         # No meetings found in the time window
         return [] 
\ No newline at end of file
@@ -1,11 +1,28 @@
+from collections import deque
 from datetime import datetime, timedelta
 import json
+import operator
 import os
+import time
 from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How long score history is kept, in seconds
+SCORE_HISTORY_WINDOW = 24 * 60 * 60
+# Upper bound on stored entries (one per minute over the window)
+SCORE_HISTORY_MAXLEN = 24 * 60
+
+# Fixed order of the score components
+SCORE_COMPONENTS = (
+    'break_compliance',
+    'work_duration',
+    'activity_balance',
+    'schedule_adherence',
+    'system_usage',
+)
+
 class WellnessScore:
     def __init__(self):
         self.score_weights = {
@@ -16,7 +33,11 @@ class WellnessScore:
             'system_usage': 0.1       # Healthy system resource usage
         }
         
-        self.score_history = []
+        # Entries in time order, 'ts' is epoch seconds
+        self.score_history = deque(maxlen=SCORE_HISTORY_MAXLEN)
+        
+        # Weights in SCORE_COMPONENTS order for the weighted sum
+        self._weights_vector = tuple(self.score_weights[metric] for metric in SCORE_COMPONENTS)
         self.current_score = 100  # Start with a perfect score
         
     def calculate_break_compliance_score(self, breaks_taken: int, breaks_suggested: int) -> float:
@@ -144,26 +165,24 @@ class WellnessScore:
                 scores['break_compliance'] = 70  # Break compliance issue
                 
             # If there's a sedentary attribute in the metrics
-            if metrics.get('focus_mode') == 'normal' and 'sedentary_minutes' in str(metrics):
+            if metrics.get('focus_mode') == 'normal' and 'sedentary_minutes' in metrics:
                 scores['activity_balance'] = 60  # Sedentary issue
         
         # Calculate weighted average
-        new_score = sum(scores[metric] * weight 
-                       for metric, weight in self.score_weights.items())
+        new_score = sum(map(operator.mul, map(scores.__getitem__, SCORE_COMPONENTS), self._weights_vector))
         
         # Record history
+        now = time.time()
         self.score_history.append({
-            'timestamp': datetime.now().isoformat(),
+            'ts': now,
             'score': new_score,
             'component_scores': scores
         })
         
-        # Keep only last 24 hours of history
-        cutoff = datetime.now() - timedelta(hours=24)
-        self.score_history = [
-            entry for entry in self.score_history
-            if datetime.fromisoformat(entry['timestamp']) > cutoff
-        ]
+        # Keep only last 24 hours of history (entries are appended in time order)
+        cutoff = now - SCORE_HISTORY_WINDOW
+        while self.score_history[0]['ts'] <= cutoff:
+            self.score_history.popleft()
         
         self.current_score = new_score
         return new_score
@@ -1,224 +1,286 @@
 from datetime import datetime, time, timezone
+import bisect
+import functools
+import itertools
 import random
+import threading
 from user_preferences import UserPreferences, BreakFeedback
-from ollama_client import OllamaClient
 import logging
-import requests
-import numpy as np
-from typing import Dict, List, Optional, Tuple
-import math
-import os
-import urllib3
+from typing import TYPE_CHECKING, Dict, Optional
+from time import monotonic
+from types import MappingProxyType
 
 from config import Config
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+if TYPE_CHECKING:
+    from ollama_client import OllamaClient
 
 logger = logging.getLogger(__name__)
 
+# Contribution of each system stat to the activity level
+CPU_ACTIVITY_WEIGHT = 0.4
+MEMORY_ACTIVITY_WEIGHT = 0.3
+IDLE_ACTIVITY_WEIGHT = 0.3
+
+# Break types with their titles and suggestions, as parallel tuples indexed by type
+BREAK_TYPE_NAMES = (
+    'eye_break',
+    'stretch_break',
+    'posture_break',
+    'deep_breathing',
+    'mindfulness',
+    'walk_break',
+    'hydration_break',
+    'nature_break',
+    'creative_break',
+)
+_BREAK_TITLES = (
+    'Eye Care Break',  # eye_break
+    'Quick Stretch',  # stretch_break
+    'Posture Reset',  # posture_break
+    'Breathing Exercise',  # deep_breathing
+    'Mindfulness Moment',  # mindfulness
+    'Walking Break',  # walk_break
+    'Hydration Break',  # hydration_break
+    'Nature Connection',  # nature_break
+    'Creative Pause',  # creative_break
+)
+_BREAK_SUGGESTIONS = (
+    (  # eye_break
+        "Look at something 20 feet away for 20 seconds (20-20-20 rule)",
+        "Gently close your eyes and roll them in circles",
+        "Cup your hands over your eyes for 30 seconds of darkness",
+        "Focus on an object far away, then one up close, alternating 5 times",
+        "Blink rapidly for 15 seconds to refresh your eyes",
+    ),
+    (  # stretch_break
+        "Stand up and stretch your arms overhead",
+        "Gentle neck rotations - 5 each direction",
+        "Shoulder rolls - 10 forward and backward",
+        "Wrist and finger stretches for typing relief",
+        "Touch your toes or reach as far down as comfortable",
+        "Side stretches - reach arm overhead and lean to each side",
+        "Desk pushups - hands on desk edge, step back and do 5-10 pushups",
+    ),
+    (  # posture_break
+        "Stand up straight against a wall to realign your spine",
+        "Roll your shoulders back and down to correct hunching",
+        "Tuck your chin slightly to align your neck properly",
+        "Check that your screen is at eye level and adjust if needed",
+        "Sit with both feet flat on floor, back supported, for proper alignment",
+    ),
+    (  # deep_breathing
+        "4-7-8 breath: Inhale for 4, hold for 7, exhale for 8 counts",
+        "Take 5 deep belly breaths, focusing on full exhales",
+        "Box breathing: Equal counts of inhale, hold, exhale, hold",
+        "Alternate nostril breathing for 1 minute",
+        "Lion's breath: Inhale through nose, exhale with open mouth and tongue out",
+    ),
+    (  # mindfulness
+        "Focus on physical sensations for 1 minute without judgment",
+        "Notice 5 things you can see, 4 you can touch, 3 you can hear, 2 you can smell, 1 you can taste",
+        "Perform a quick body scan from head to toe, noticing sensations",
+        "Practice mindful eating with a small snack, focusing on all sensory aspects",
+        "Close your eyes and focus on your breath for 2 minutes, returning whenever mind wanders",
+    ),
+    (  # walk_break
+        "Take a short walk around your space",
+        "Walk to get a glass of water",
+        "Do a lap around your office or home",
+        "Step outside for fresh air if possible",
+        "Walk up and down stairs for 2 minutes",
+        "Walk to a window and enjoy the view for a moment",
+        "Walk in place with high knees for 1 minute",
+    ),
+    (  # hydration_break
+        "Time for a glass of water!",
+        "Refill your water bottle",
+        "Have some herbal tea",
+        "Remember to stay hydrated",
+        "Try water with a slice of lemon or cucumber",
+        "Check your water intake for the day and adjust if needed",
+        "Prepare a warm cup of caffeine-free tea",
+    ),
+    (  # nature_break
+        "Look out a window at natural elements for 2 minutes",
+        "If possible, step outside and feel the sun or breeze",
+        "Water or check on a houseplant",
+        "Take a moment to listen to nature sounds, even from an app",
+        "Look at images of natural scenes for a mental refresh",
+    ),
+    (  # creative_break
+        "Doodle or sketch for 3 minutes",
+        "Write a haiku about your current mood",
+        "List 3 ideas for something unrelated to work",
+        "Play a quick word association game with yourself",
+        "Listen to a favorite song and focus just on the music",
+    ),
+)
+_BREAK_TYPE_INDEX = {name: idx for idx, name in enumerate(BREAK_TYPE_NAMES)}
+
+# Hour boundaries and the time category each interval maps to (before 5am wraps to evening)
+_TIME_CATEGORY_BOUNDS = (5, 11, 14, 18)
+_TIME_CATEGORIES = ("evening", "morning", "midday", "afternoon", "evening")
+# Time category for each hour of the day, expanded from the boundaries above
+_HOUR_CATEGORY = tuple(
+    _TIME_CATEGORIES[bisect.bisect_right(_TIME_CATEGORY_BOUNDS, hour)] for hour in range(24)
+)
+
+# Seconds a cached LLM status stays fresh, shorter while Ollama is unavailable
+_LLM_STATUS_REFRESH_SECONDS = 10.0
+_LLM_STATUS_ERROR_REFRESH_SECONDS = 2.0
+
+# Deep focus is left uninterrupted until it has lasted this long
+_DEEP_FOCUS_GRACE_MINUTES = 60
+
+# Focus modes that bring breaks forward (high intensity) or push them back (low intensity)
+_HIGH_INTENSITY_MODES = frozenset(("intense", "erratic-high"))
+_LOW_INTENSITY_MODES = frozenset(("casual", "browsing", "low-activity"))
+
+# Work sessions longer than this favour physical and eye breaks by the factors below
+_LONG_SESSION_MINUTES = 90
+_LONG_SESSION_FACTORS = MappingProxyType({
+    "walk_break": 1.5,
+    "stretch_break": 1.5,
+    "posture_break": 1.5,
+    "eye_break": 1.3,
+})
+
+def _combine_modifiers(time_weights, activity_weights) -> MappingProxyType:
+    """
+    Multiply every time-of-day modifier table with every activity level table
+    
+    Returns:
+        Read-only mapping of (time_category, activity_category) to per-break-type modifiers
+    """
+    combined = {}
+    for time_category, time_modifiers in time_weights.items():
+        for activity_category, activity_modifiers in activity_weights.items():
+            break_types = time_modifiers.keys() | activity_modifiers.keys()
+            combined[(time_category, activity_category)] = MappingProxyType({
+                break_type: time_modifiers.get(break_type, 1.0) * activity_modifiers.get(break_type, 1.0)
+                for break_type in break_types
+            })
+    return MappingProxyType(combined)
+
 class WellnessSuggestions:
+    MORNING_START = time(9, 0)
+    LUNCH_START = time(12, 0)
+    LUNCH_END = time(14, 0)
+    EVENING_START = time(17, 0)
+    
+    # Time-based weights for different break types
+    TIME_WEIGHTS = MappingProxyType({k: MappingProxyType(v) for k, v in {
+        "morning": {
+            "eye_break": 1.8,
+            "stretch_break": 1.2,
+            "posture_break": 1.5,
+            "deep_breathing": 1.4,
+            "mindfulness": 1.7,
+            "walk_break": 0.7,
+            "hydration_break": 1.2,
+            "nature_break": 0.8,
+            "creative_break": 0.8
+        },
+        "midday": {
+            "eye_break": 1.3,
+            "stretch_break": 1.4,
+            "posture_break": 1.3,
+            "deep_breathing": 1.2,
+            "mindfulness": 1.0,
+            "walk_break": 1.5,
+            "hydration_break": 1.4,
+            "nature_break": 1.3,
+            "creative_break": 1.0
+        },
+        "afternoon": {
+            "eye_break": 1.5,
+            "stretch_break": 1.3,
+            "posture_break": 1.2,
+            "deep_breathing": 1.0,
+            "mindfulness": 1.2,
+            "walk_break": 1.8,
+            "hydration_break": 1.3,
+            "nature_break": 1.2,
+            "creative_break": 1.6
+        },
+        "evening": {
+            "eye_break": 1.8,
+            "stretch_break": 1.0,
+            "posture_break": 1.0,
+            "deep_breathing": 1.5,
+            "mindfulness": 1.5,
+            "walk_break": 0.8,
+            "hydration_break": 0.9,
+            "nature_break": 1.0,
+            "creative_break": 1.2
+        }
+    }.items()})
+    
+    # Activity level weights
+    ACTIVITY_WEIGHTS = MappingProxyType({k: MappingProxyType(v) for k, v in {
+        "high": {  # CPU/memory usage high, user very active
+            "eye_break": 1.8,
+            "stretch_break": 1.6,
+            "posture_break": 1.5,
+            "deep_breathing": 1.3,
+            "mindfulness": 0.8,
+            "walk_break": 1.0,
+            "hydration_break": 1.4,
+            "nature_break": 0.7,
+            "creative_break": 0.6
+        },
+        "medium": {  # Normal activity
+            "eye_break": 1.3,
+            "stretch_break": 1.3,
+            "posture_break": 1.3,
+            "deep_breathing": 1.3,
+            "mindfulness": 1.3,
+            "walk_break": 1.3,
+            "hydration_break": 1.3,
+            "nature_break": 1.3,
+            "creative_break": 1.3
+        },
+        "low": {  # User not very active, idle periods
+            "eye_break": 0.8,
+            "stretch_break": 0.9,
+            "posture_break": 0.8,
+            "deep_breathing": 1.5,
+            "mindfulness": 1.8,
+            "walk_break": 1.7,
+            "hydration_break": 1.2,
+            "nature_break": 1.5,
+            "creative_break": 1.7
+        }
+    }.items()})
+    
+    # Time and activity modifiers already multiplied together for each combination
+    COMBINED_MODIFIERS = _combine_modifiers(TIME_WEIGHTS, ACTIVITY_WEIGHTS)
+
     def __init__(self):
-        self.morning_start = time(9, 0)
-        self.lunch_start = time(12, 0)
-        self.lunch_end = time(14, 0)
-        self.evening_start = time(17, 0)
-        self.user_prefs = UserPreferences()
-        self.ollama = OllamaClient()
         self.last_break_check = datetime.now()
         self.last_suggestion_time = None
         self.last_check_time = None
-        
-        # Time-based weights for different break types
-        self.time_weights = {
-            "morning": {
-                "eye_break": 1.8,
-                "stretch_break": 1.2,
-                "posture_break": 1.5,
-                "deep_breathing": 1.4,
-                "mindfulness": 1.7,
-                "walk_break": 0.7,
-                "hydration_break": 1.2,
-                "nature_break": 0.8,
-                "creative_break": 0.8
-            },
-            "midday": {
-                "eye_break": 1.3,
-                "stretch_break": 1.4,
-                "posture_break": 1.3,
-                "deep_breathing": 1.2,
-                "mindfulness": 1.0,
-                "walk_break": 1.5,
-                "hydration_break": 1.4,
-                "nature_break": 1.3,
-                "creative_break": 1.0
-            },
-            "afternoon": {
-                "eye_break": 1.5,
-                "stretch_break": 1.3,
-                "posture_break": 1.2,
-                "deep_breathing": 1.0,
-                "mindfulness": 1.2,
-                "walk_break": 1.8,
-                "hydration_break": 1.3,
-                "nature_break": 1.2,
-                "creative_break": 1.6
-            },
-            "evening": {
-                "eye_break": 1.8,
-                "stretch_break": 1.0,
-                "posture_break": 1.0,
-                "deep_breathing": 1.5,
-                "mindfulness": 1.5,
-                "walk_break": 0.8,
-                "hydration_break": 0.9,
-                "nature_break": 1.0,
-                "creative_break": 1.2
-            }
-        }
-        
-        # Activity level weights
-        self.activity_weights = {
-            "high": {  # CPU/memory usage high, user very active
-                "eye_break": 1.8,
-                "stretch_break": 1.6,
-                "posture_break": 1.5,
-                "deep_breathing": 1.3,
-                "mindfulness": 0.8,
-                "walk_break": 1.0,
-                "hydration_break": 1.4,
-                "nature_break": 0.7,
-                "creative_break": 0.6
-            },
-            "medium": {  # Normal activity
-                "eye_break": 1.3,
-                "stretch_break": 1.3,
-                "posture_break": 1.3,
-                "deep_breathing": 1.3,
-                "mindfulness": 1.3,
-                "walk_break": 1.3,
-                "hydration_break": 1.3,
-                "nature_break": 1.3,
-                "creative_break": 1.3
-            },
-            "low": {  # User not very active, idle periods
-                "eye_break": 0.8,
-                "stretch_break": 0.9,
-                "posture_break": 0.8,
-                "deep_breathing": 1.5,
-                "mindfulness": 1.8,
-                "walk_break": 1.7,
-                "hydration_break": 1.2,
-                "nature_break": 1.5,
-                "creative_break": 1.7
-            }
-        }
-
-        # Different types of breaks with their suggestions
-        self.break_types = {
-            'eye_break': {
-                'title': 'Eye Care Break',
-                'suggestions': [
-                    "Look at something 20 feet away for 20 seconds (20-20-20 rule)",
-                    "Gently close your eyes and roll them in circles",
-                    "Cup your hands over your eyes for 30 seconds of darkness",
-                    "Focus on an object far away, then one up close, alternating 5 times",
-                    "Blink rapidly for 15 seconds to refresh your eyes"
-                ]
-            },
-            'stretch_break': {
-                'title': 'Quick Stretch',
-                'suggestions': [
-                    "Stand up and stretch your arms overhead",
-                    "Gentle neck rotations - 5 each direction",
-                    "Shoulder rolls - 10 forward and backward",
-                    "Wrist and finger stretches for typing relief",
-                    "Touch your toes or reach as far down as comfortable",
-                    "Side stretches - reach arm overhead and lean to each side",
-                    "Desk pushups - hands on desk edge, step back and do 5-10 pushups"
-                ]
-            },
-            'posture_break': {
-                'title': 'Posture Reset',
-                'suggestions': [
-                    "Stand up straight against a wall to realign your spine",
-                    "Roll your shoulders back and down to correct hunching",
-                    "Tuck your chin slightly to align your neck properly",
-                    "Check that your screen is at eye level and adjust if needed",
-                    "Sit with both feet flat on floor, back supported, for proper alignment"
-                ]
-            },
-            'deep_breathing': {
-                'title': 'Breathing Exercise',
-                'suggestions': [
-                    "4-7-8 breath: Inhale for 4, hold for 7, exhale for 8 counts",
-                    "Take 5 deep belly breaths, focusing on full exhales",
-                    "Box breathing: Equal counts of inhale, hold, exhale, hold",
-                    "Alternate nostril breathing for 1 minute",
-                    "Lion's breath: Inhale through nose, exhale with open mouth and tongue out"
-                ]
-            },
-            'mindfulness': {
-                'title': 'Mindfulness Moment',
-                'suggestions': [
-                    "Focus on physical sensations for 1 minute without judgment",
-                    "Notice 5 things you can see, 4 you can touch, 3 you can hear, 2 you can smell, 1 you can taste",
-                    "Perform a quick body scan from head to toe, noticing sensations",
-                    "Practice mindful eating with a small snack, focusing on all sensory aspects",
-                    "Close your eyes and focus on your breath for 2 minutes, returning whenever mind wanders"
-                ]
-            },
-            'walk_break': {
-                'title': 'Walking Break',
-                'suggestions': [
-                    "Take a short walk around your space",
-                    "Walk to get a glass of water",
-                    "Do a lap around your office or home",
-                    "Step outside for fresh air if possible",
-                    "Walk up and down stairs for 2 minutes",
-                    "Walk to a window and enjoy the view for a moment",
-                    "Walk in place with high knees for 1 minute"
-                ]
-            },
-            'hydration_break': {
-                'title': 'Hydration Break',
-                'suggestions': [
-                    "Time for a glass of water!",
-                    "Refill your water bottle",
-                    "Have some herbal tea",
-                    "Remember to stay hydrated",
-                    "Try water with a slice of lemon or cucumber",
-                    "Check your water intake for the day and adjust if needed",
-                    "Prepare a warm cup of caffeine-free tea"
-                ]
-            },
-            'nature_break': {
-                'title': 'Nature Connection',
-                'suggestions': [
-                    "Look out a window at natural elements for 2 minutes",
-                    "If possible, step outside and feel the sun or breeze",
-                    "Water or check on a houseplant",
-                    "Take a moment to listen to nature sounds, even from an app",
-                    "Look at images of natural scenes for a mental refresh"
-                ]
-            },
-            'creative_break': {
-                'title': 'Creative Pause',
-                'suggestions': [
-                    "Doodle or sketch for 3 minutes",
-                    "Write a haiku about your current mood",
-                    "List 3 ideas for something unrelated to work",
-                    "Play a quick word association game with yourself",
-                    "Listen to a favorite song and focus just on the music"
-                ]
-            }
-        }
+        self._llm_status: Optional[dict] = None  # Latest status from check_llm_status
+        self._llm_status_checked = 0.0  # monotonic() time of that status
+        self._llm_status_lock = threading.Lock()
+        self._llm_status_refreshing = False  # A background refresh is in flight
+    
+    @functools.cached_property
+    def user_prefs(self) -> UserPreferences:
+        """User preferences, loaded from disk on first use"""
+        return UserPreferences()
+    
+    @functools.cached_property
+    def ollama(self) -> 'OllamaClient':
+        """Ollama client, created (and its availability probed) on first use"""
+        # Imported here so processes that never talk to the LLM don't load requests
+        from ollama_client import OllamaClient
+        return OllamaClient(model=Config.OLLAMA_MODEL)
 
-    def calculate_activity_level(self, activity_stats: dict) -> float:
+    @staticmethod
+    def calculate_activity_level(activity_stats: dict) -> float:
         """Calculate normalized activity level from system stats"""
-        cpu_weight = 0.4
-        memory_weight = 0.3
-        idle_weight = 0.3
-        
         cpu_score = min(activity_stats.get('cpu_percent', 0) / 100.0, 1.0)
         memory_score = min(activity_stats.get('memory_percent', 0) / 100.0, 1.0)
         
@@ -226,9 +288,18 @@ class WellnessSuggestions:
         idle_duration = activity_stats.get('idle_duration', 0)
         idle_score = 1.0 - min(idle_duration / 3600.0, 1.0)  # Normalize to 1 hour
         
-        return (cpu_score * cpu_weight + 
-                memory_score * memory_weight + 
-                idle_score * idle_weight)
+        return (cpu_score * CPU_ACTIVITY_WEIGHT +
+                memory_score * MEMORY_ACTIVITY_WEIGHT +
+                idle_score * IDLE_ACTIVITY_WEIGHT)
+
+    @staticmethod
+    def is_protected_deep_focus(focus_level: Optional[str], active_minutes: float) -> bool:
+        """
+        Whether the user is in deep focus that shouldn't be interrupted yet
+        
+        Callers can check this before get_break_suggestion to skip the LLM call entirely.
+        """
+        return focus_level == "deep-focus" and active_minutes < _DEEP_FOCUS_GRACE_MINUTES
 
     def get_activity_category(self, activity_level: float) -> str:
         """Categorize activity level as high, medium, or low"""
@@ -241,16 +312,7 @@ class WellnessSuggestions:
             
     def get_time_category(self, current_time: datetime) -> str:
         """Categorize time of day"""
-        hour = current_time.hour
-        
-        if 5 <= hour < 11:
-            return "morning"
-        elif 11 <= hour < 14:
-            return "midday"
-        elif 14 <= hour < 18:
-            return "afternoon"
-        else:
-            return "evening"
+        return _HOUR_CATEGORY[current_time.hour]
             
     def get_break_weights(self, time_category: str, activity_category: str, work_duration_minutes: int) -> Dict[str, float]:
         """Calculate weighted scores for each break type based on context"""
@@ -267,28 +329,23 @@ class WellnessSuggestions:
             "creative_break": 1.0
         })
         
-        # Apply time of day and activity level modifiers
-        time_modifiers = self.time_weights.get(time_category, self.time_weights["afternoon"])
-        activity_modifiers = self.activity_weights.get(activity_category, self.activity_weights["medium"])
+        # Apply time of day and activity level modifiers, defaulting to afternoon / medium
+        if time_category not in self.TIME_WEIGHTS:
+            time_category = "afternoon"
+        if activity_category not in self.ACTIVITY_WEIGHTS:
+            activity_category = "medium"
+        modifiers = self.COMBINED_MODIFIERS[(time_category, activity_category)]
+        
+        # Duration factor: longer work = more need for physical breaks
+        duration_factors = _LONG_SESSION_FACTORS if work_duration_minutes > _LONG_SESSION_MINUTES else {}
         
         # Calculate combined weights
         combined_weights = {}
         for break_type in base_weights:
-            # If break type isn't in modifiers, default to 1.0
-            time_mod = time_modifiers.get(break_type, 1.0)
-            activity_mod = activity_modifiers.get(break_type, 1.0)
-            
-            # Duration factor: longer work = more need for physical breaks
-            duration_factor = 1.0
-            if work_duration_minutes > 90:
-                # For long work sessions, prioritize physical breaks
-                if break_type in ["walk_break", "stretch_break", "posture_break"]:
-                    duration_factor = 1.5
-                elif break_type == "eye_break":
-                    duration_factor = 1.3
+            duration_factor = duration_factors.get(break_type, 1.0)
             
-            # Combine all factors
-            combined_weights[break_type] = base_weights.get(break_type, 1.0) * time_mod * activity_mod * duration_factor
+            # Combine all factors (break types without modifiers default to 1.0)
+            combined_weights[break_type] = base_weights.get(break_type, 1.0) * modifiers.get(break_type, 1.0) * duration_factor
         
         # Check if we have feedback history to adjust weights
         if self.user_prefs.break_history:
@@ -298,59 +355,103 @@ class WellnessSuggestions:
     
     def _adjust_weights_from_history(self, weights: Dict[str, float]) -> None:
         """Adjust weights based on break history and effectiveness ratings"""
-        # Use only the last 20 breaks with ratings
-        recent_breaks = [b for b in self.user_prefs.break_history[-20:] 
-                         if b.effectiveness_rating is not None]
+        # Use only the last 20 breaks with ratings, walked from the end without copying
+        recent_breaks = itertools.islice(reversed(self.user_prefs.break_history), 20)
         
-        if not recent_breaks:
-            return
-            
-        # Calculate average effectiveness per break type
-        type_ratings = {}
+        # Running rating sum and count per break type
+        rating_sums = {}
+        rating_counts = {}
         for b in recent_breaks:
-            if b.break_type not in type_ratings:
-                type_ratings[b.break_type] = []
-            type_ratings[b.break_type].append(b.effectiveness_rating)
-        
-        # Average ratings
-        avg_ratings = {}
-        for break_type, ratings in type_ratings.items():
-            if ratings:
-                avg_ratings[break_type] = sum(ratings) / len(ratings)
-        
-        # Adjust weights based on ratings (1-5 scale)
-        for break_type, rating in avg_ratings.items():
+            if b.effectiveness_rating is not None:
+                rating_sums[b.break_type] = rating_sums.get(b.break_type, 0) + b.effectiveness_rating
+                rating_counts[b.break_type] = rating_counts.get(b.break_type, 0) + 1
+        
+        # Adjust weights based on average ratings (1-5 scale)
+        for break_type, rating_sum in rating_sums.items():
             if break_type in weights:
+                rating = rating_sum / rating_counts[break_type]
                 # Convert 1-5 scale to multiplier (0.7-1.3)
                 multiplier = 0.7 + (rating - 1) * 0.15
                 weights[break_type] *= multiplier
     
     def select_break_type(self, weights: Dict[str, float]) -> str:
         """Select a break type based on weighted probabilities"""
-        break_types = list(weights.keys())
-        weights_list = [weights[bt] for bt in break_types]
+        # Cumulative weights in the canonical type order; the last entry is the total
+        cum_weights = list(itertools.accumulate(weights.get(name, 0.0) for name in BREAK_TYPE_NAMES))
+        if cum_weights[-1] == 0:  # Safety check
+            return random.choice(BREAK_TYPE_NAMES)
         
-        # Convert to probabilities
-        total = sum(weights_list)
-        if total == 0:  # Safety check
-            return random.choice(list(self.break_types.keys()))
-            
-        probabilities = [w/total for w in weights_list]
-        
-        return np.random.choice(break_types, p=probabilities)
+        return random.choices(BREAK_TYPE_NAMES, cum_weights=cum_weights)[0]
 
     def check_llm_status(self) -> dict:
-        """Check if the LLM is available and return status info"""
-        try:
-            # Check if Ollama is responding
-            ollama_host = 'localhost' if not hasattr(self.ollama, 'host') or not self.ollama.host else self.ollama.host
-            ollama_port = '11434'  # Standard Ollama port
+        """
+        Return the latest LLM status without waiting on Ollama
+        
+        A stale status starts one background refresh and the last snapshot is returned
+        straight away, so dashboard requests never block on the Ollama probe.
+        """
+        with self._llm_status_lock:
+            previous = self._llm_status
+            if previous is not None and previous.get('is_available'):
+                max_age = _LLM_STATUS_REFRESH_SECONDS
+            else:
+                max_age = _LLM_STATUS_ERROR_REFRESH_SECONDS
             
+            stale = previous is None or monotonic() - self._llm_status_checked >= max_age
+            if stale and not self._llm_status_refreshing:
+                # Only log a failure when Ollama goes down, not on every check while it stays down
+                log_failures = previous is None or previous.get('is_available', False)
+                self._llm_status_refreshing = True
+                threading.Thread(target=self._refresh_llm_status, args=(log_failures,),
+                                 name='llm-status-refresh', daemon=True).start()
+            
+            if previous is None:
+                # Nothing fetched yet; the first refresh is still running
+                return {
+                    'is_available': False,
+                    'model': Config.OLLAMA_MODEL,
+                    'last_check': None,
+                    'note': 'Checking Ollama availability...'
+                }
+            status = dict(previous)
+        
+        if 'last_suggestion' in status:
+            status['last_suggestion'] = self.last_suggestion_time.isoformat() if self.last_suggestion_time else None
+        return status
+    
+    def _refresh_llm_status(self, log_failures: bool) -> None:
+        """Fetch the LLM status outside the lock and publish it for check_llm_status"""
+        status = None
+        try:
+            status = self._fetch_llm_status(log_failures)
+        finally:
+            with self._llm_status_lock:
+                if status is not None:
+                    self._llm_status = status
+                    self._llm_status_checked = monotonic()
+                self._llm_status_refreshing = False
+    
+    def _fetch_llm_status(self, log_failures: bool = True) -> dict:
+        """
+        Query Ollama for the model list and build the status info
+        
+        Args:
+            log_failures: Log connection failures as errors (otherwise at debug level)
+        """
+        import requests
+        
+        log_error = logger.error if log_failures else logger.debug
+        checked_at = datetime.now().isoformat()
+        model_name = self.ollama.model
+        ollama_host = self.ollama.host or 'localhost'
+        ollama_port = self.ollama.port
+        
+        try:
             # Log attempt
             logger.info(f"Checking Ollama availability at http://{ollama_host}:{ollama_port}/api/tags")
             
             # Set a timeout for the request to avoid hanging
-            response = requests.get(f'http://{ollama_host}:{ollama_port}/api/tags', timeout=3)
+            response = self.ollama.session.get(f'http://{ollama_host}:{ollama_port}/api/tags', timeout=3)
             
             # Log response status
             logger.info(f"Ollama API response status: {response.status_code}")
@@ -360,8 +461,8 @@ class WellnessSuggestions:
             logger.info(f"Found {len(response_data.get('models', []))} models from Ollama API")
             
             # Find our model in the response
-            models_data = response_data.get('models', [])
-            model_info = next((m for m in models_data if m.get('name') == self.ollama.model), None)
+            models_by_name = {m.get('name'): m for m in response_data.get('models', [])}
+            model_info = models_by_name.get(model_name)
             
             if model_info:
                 # Get frequency in minutes for display
@@ -370,63 +471,65 @@ class WellnessSuggestions:
                 
                 return {
                     'is_available': True,
-                    'model': self.ollama.model,
+                    'model': model_name,
                     'model_size': model_info.get('details', {}).get('parameter_size', 'Unknown'),
-                    'last_check': datetime.now().isoformat(),
+                    'last_check': checked_at,
                     'last_suggestion': self.last_suggestion_time.isoformat() if self.last_suggestion_time else None,
                     'check_interval': f'{int(frequency_minutes)} minutes',
                     'suggestion_threshold': '45 minutes of activity'
                 }
             else:
                 # Model not found but API is available
-                logger.warning(f"Ollama is running but model '{self.ollama.model}' not found. Available models: {[m.get('name') for m in models_data]}")
+                (logger.warning if log_failures else logger.debug)(f"Ollama is running but model '{model_name}' not found. Available models: {list(models_by_name)}")
                 return {
                     'is_available': False,
-                    'model': self.ollama.model,
+                    'model': model_name,
                     'model_size': 'Unknown',
-                    'last_check': datetime.now().isoformat(),
-                    'note': f"Model '{self.ollama.model}' not found in Ollama. Try 'ollama pull {self.ollama.model}'"
+                    'last_check': checked_at,
+                    'note': f"Model '{model_name}' not found in Ollama. Try 'ollama pull {model_name}'"
                 }
                 
         except requests.exceptions.ConnectionError as e:
-            logger.error(f"Connection error reaching Ollama: {e}")
+            log_error(f"Connection error reaching Ollama: {e}")
             return {
                 'is_available': False,
                 'error': f"Cannot connect to Ollama at http://{ollama_host}:{ollama_port}. Is Ollama running?",
-                'last_check': datetime.now().isoformat(),
-                'model': self.ollama.model if hasattr(self, 'ollama') and hasattr(self.ollama, 'model') else 'unknown'
+                'last_check': checked_at,
+                'model': model_name
             }
         except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout reaching Ollama: {e}")
+            log_error(f"Timeout reaching Ollama: {e}")
             return {
                 'is_available': False,
                 'error': f"Timeout connecting to Ollama. Service may be overloaded.",
-                'last_check': datetime.now().isoformat(),
-                'model': self.ollama.model if hasattr(self, 'ollama') and hasattr(self.ollama, 'model') else 'unknown'
+                'last_check': checked_at,
+                'model': model_name
             }
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request error reaching Ollama: {e}")
+            log_error(f"Request error reaching Ollama: {e}")
             return {
                 'is_available': False,
                 'error': f"Error connecting to Ollama: {str(e)}",
-                'last_check': datetime.now().isoformat(),
-                'model': self.ollama.model if hasattr(self, 'ollama') and hasattr(self.ollama, 'model') else 'unknown'
+                'last_check': checked_at,
+                'model': model_name
             }
         except Exception as e:
-            logger.error(f"Unexpected error checking Ollama status: {e}")
+            log_error(f"Unexpected error checking Ollama status: {e}")
             return {
                 'is_available': False,
                 'error': f"Unexpected error: {str(e)}",
-                'last_check': datetime.now().isoformat(),
-                'model': self.ollama.model if hasattr(self, 'ollama') and hasattr(self.ollama, 'model') else 'unknown'
+                'last_check': checked_at,
+                'model': model_name
             }
 
-    def get_break_suggestion(self, activity_stats: dict) -> dict:
+    def get_break_suggestion(self, activity_stats: dict,
+                             upcoming_meetings: Optional[list] = None) -> dict:
         """
         Get personalized break suggestion based on current context
         
         Args:
             activity_stats: Dictionary containing activity statistics
+            upcoming_meetings: Meetings in the next 60 minutes, if the caller already fetched them
             
         Note:
             If activity_stats contains focus_level and focus_mode from the FocusMonitorAgent,
@@ -464,11 +567,12 @@ class WellnessSuggestions:
                 'active_apps': activity_stats.get('active_processes', [])
             }
         
-        # Get upcoming meetings if available
-        upcoming_meetings = self.user_prefs.get_upcoming_meetings(
-            lookback_minutes=0, 
-            lookahead_minutes=60
-        )
+        # Get upcoming meetings if the caller didn't already fetch them
+        if upcoming_meetings is None:
+            upcoming_meetings = self.user_prefs.get_upcoming_meetings(
+                lookback_minutes=0, 
+                lookahead_minutes=60
+            )
         
         if upcoming_meetings:
             next_meeting = upcoming_meetings[0]
@@ -477,9 +581,7 @@ class WellnessSuggestions:
             if next_meeting_time:
                 # Calculate minutes until next meeting
                 try:
-                    if isinstance(next_meeting_time, str):
-                        next_meeting_time = datetime.fromisoformat(next_meeting_time)
-                    
+                    next_meeting_time = self.user_prefs.parse_meeting_start(next_meeting_time)
                     time_diff = (next_meeting_time - current_time).total_seconds() / 60
                     context['next_meeting_in_minutes'] = int(time_diff)
                 except Exception as e:
@@ -494,67 +596,80 @@ class WellnessSuggestions:
         
         try:
             # Use the new MCP-style message format
-            suggestion = self.ollama.get_suggestion(context)
+            suggestion, from_cache = self.ollama.get_suggestion_with_source(context)
             self.last_suggestion_time = datetime.now()
             
-            # Update break type weights based on suggestion
-            self._update_break_weights(suggestion.get('type', 'stretch_break'))
+            # Update break type weights based on suggestion (a replayed answer isn't a new one)
+            if not from_cache:
+                self._update_break_weights(suggestion.get('type', 'stretch_break'))
             
             return suggestion
             
         except Exception as e:
             # Fallback to previous method if the new one fails
             logger.error(f"Error using MCP message format, falling back: {e}")
-            try:
-                # Get personalized break weights
-                break_weights = self.get_break_weights(
-                    time_category, 
-                    activity_category, 
-                    active_duration_minutes
-                )
-                
-                # Select break type based on weights
-                selected_break_type = self.select_break_type(break_weights)
-                
-                # Get break details
-                break_info = self.break_types.get(selected_break_type)
-                if not break_info:
-                    # Fallback if somehow we selected an invalid break type
-                    selected_break_type = random.choice(list(self.break_types.keys()))
-                    break_info = self.break_types[selected_break_type]
-                
-                # Select a random suggestion for this break type
-                suggestion_text = random.choice(break_info['suggestions'])
-                
-                # Get optimal duration based on user preferences
-                duration = self.user_prefs.get_optimal_break_duration(selected_break_type)
-                
-                # Create fallback suggestion
-                fallback_suggestion = {
-                    'title': break_info['title'],
-                    'activity': suggestion_text,
-                    'duration': duration,
-                    'benefits': ["Reduces fatigue", "Improves focus"],
-                    'type': selected_break_type
-                }
-                
-                # Update break type weights
-                self._update_break_weights(selected_break_type)
-                self.last_suggestion_time = datetime.now()
-                
-                return fallback_suggestion
-                
-            except Exception as nested_e:
-                logger.error(f"Both suggestion methods failed: {nested_e}")
-                # Ultimate fallback
-                self.last_suggestion_time = datetime.now()
-                return {
-                    'title': "Quick Break",
-                    'activity': "Stand up and stretch for a minute",
-                    'duration': 2,
-                    'benefits': ["Reduces fatigue", "Improves circulation"],
-                    'type': "stretch_break"
-                }
+            return self._fallback_suggestion(time_category, activity_category, active_duration_minutes)
+
+    def _fallback_suggestion(self, time_category: str, activity_category: str,
+                             active_duration_minutes: int) -> dict:
+        """
+        Pick a break locally from the weighted break types when the LLM is unavailable
+        
+        Args:
+            time_category: Time of day category already computed by get_break_suggestion
+            activity_category: Activity level category already computed by get_break_suggestion
+            active_duration_minutes: Minutes of continuous work
+        """
+        try:
+            # Get personalized break weights
+            break_weights = self.get_break_weights(
+                time_category, 
+                activity_category, 
+                active_duration_minutes
+            )
+            
+            # Select break type based on weights
+            selected_break_type = self.select_break_type(break_weights)
+            
+            # Get break details
+            break_idx = _BREAK_TYPE_INDEX.get(selected_break_type)
+            if break_idx is None:
+                # Fallback if somehow we selected an invalid break type
+                break_idx = random.randrange(len(BREAK_TYPE_NAMES))
+                selected_break_type = BREAK_TYPE_NAMES[break_idx]
+            
+            # Select a random suggestion for this break type
+            suggestion_text = random.choice(_BREAK_SUGGESTIONS[break_idx])
+            
+            # Get optimal duration based on user preferences
+            duration = self.user_prefs.get_optimal_break_duration(selected_break_type)
+            
+            # Create fallback suggestion
+            fallback_suggestion = {
+                'title': _BREAK_TITLES[break_idx],
+                'activity': suggestion_text,
+                'duration': duration,
+                'benefits': ["Reduces fatigue", "Improves focus"],
+                'type': selected_break_type
+            }
+            
+            # Update break type weights
+            self._update_break_weights(selected_break_type)
+            self.last_suggestion_time = datetime.now()
+            
+            return fallback_suggestion
+            
+        except Exception as nested_e:
+            logger.error(f"Both suggestion methods failed: {nested_e}")
+            # Ultimate fallback
+            self.last_suggestion_time = datetime.now()
+            return {
+                'title': "Quick Break",
+                'activity': "Stand up and stretch for a minute",
+                'duration': 2,
+                'benefits': ["Reduces fatigue", "Improves circulation"],
+                'type': "stretch_break"
+            }
 
     def get_wellness_advice(self, metrics: dict) -> list:
         """
@@ -580,11 +695,15 @@ class WellnessSuggestions:
 
     def _update_break_weights(self, suggested_type: str):
         """Update break type weights based on suggestion"""
+        # Ignore types the LLM made up so they don't end up in the saved preferences
+        if suggested_type not in _BREAK_TYPE_INDEX:
+            logger.warning(f"Not updating weights for unknown break type: {suggested_type}")
+            return
+        
         current_weight = self.user_prefs.preferences['break_type_weights'].get(suggested_type, 1.0)
         # Slightly increase weight for suggested type
-        new_weight = min(2.0, current_weight * 1.1)
-        self.user_prefs.preferences['break_type_weights'][suggested_type] = new_weight
-        self.user_prefs.save()
+        self.user_prefs.set_break_type_weight(suggested_type, current_weight * 1.1)
+        self.user_prefs.mark_dirty()
 
     def check_work_patterns(self, active_time_minutes, idle_time_minutes, activity_history):
         """
@@ -594,7 +713,7 @@ class WellnessSuggestions:
         If the activity_history contains focus information from FocusMonitorAgent,
         it will be used to make more intelligent break decisions.
         """
-        # Record the current check time
+        # Record the current check time (get_break_suggestion records last_suggestion_time)
         self.last_check_time = datetime.now(timezone.utc).isoformat()
         
         # Log current status for debugging
@@ -611,15 +730,14 @@ class WellnessSuggestions:
             logger.info(f"Focus level: {focus_level}, Focus mode: {focus_mode}")
             
             # Don't interrupt deep focus unless it's been going on too long
-            if focus_level == "deep-focus" and active_time_minutes < 60:
+            if self.is_protected_deep_focus(focus_level, active_time_minutes):
                 return False, None, "User in deep focus state"
                 
             # Suggest breaks more aggressively for high cognitive load activities
-            if focus_mode in ["intense", "erratic-high"] and active_time_minutes > 30:
+            if focus_mode in _HIGH_INTENSITY_MODES and active_time_minutes > 30:
                 logger.info("User in high cognitive load activity. Break suggested.")
                 suggestion = self.get_break_suggestion(activity_history)
                 if suggestion:
-                    self.last_suggestion_time = datetime.now(timezone.utc).isoformat()
                     return True, suggestion, "High cognitive load detected"
         
         # Standard idle checks
@@ -629,30 +747,35 @@ class WellnessSuggestions:
 
         # Standard active time checks - adjust based on focus mode if available
         minimum_active_time = 45  # default
-        if focus_mode in ["intense", "erratic-high"]:
+        if focus_mode in _HIGH_INTENSITY_MODES:
             minimum_active_time = 30  # suggest breaks sooner for high-intensity work
-        elif focus_mode in ["casual", "browsing", "low-activity"]:
+        elif focus_mode in _LOW_INTENSITY_MODES:
             minimum_active_time = 60  # suggest breaks later for low-intensity work
             
         if active_time_minutes < minimum_active_time:
             logger.info(f"User has only been active for {active_time_minutes} minutes. No break suggested.")
             return False, None, "Not enough active time"
 
-        # Check if there's an upcoming meeting in the next 15 minutes
+        # Fetch the next hour of meetings once; get_break_suggestion reuses them
         upcoming_meetings = self.user_prefs.get_upcoming_meetings(
             lookback_minutes=0, 
-            lookahead_minutes=15
+            lookahead_minutes=60
         )
         
-        if upcoming_meetings:
-            next_meeting = upcoming_meetings[0]
+        # Check if there's an upcoming meeting in the next 15 minutes
+        meetings_soon = [
+            m for m in upcoming_meetings
+            if (self.user_prefs.parse_meeting_start(m['start']) - current_time).total_seconds() <= 15 * 60
+        ]
+        
+        if meetings_soon:
+            next_meeting = meetings_soon[0]
             logger.info(f"Upcoming meeting at {next_meeting['start']}. No break suggested.")
             return False, None, f"Meeting soon at {next_meeting['start']}"
         
         # Get a break suggestion from the LLM
-        suggestion = self.get_break_suggestion(activity_history)
+        suggestion = self.get_break_suggestion(activity_history, upcoming_meetings=upcoming_meetings)
         if suggestion:
-            self.last_suggestion_time = datetime.now(timezone.utc).isoformat()
             return True, suggestion, "Time for a break"
         
         return False, None, "No suggestion generated"
@@ -665,7 +788,7 @@ class WellnessSuggestions:
             "is_available": is_available,
             "model": self.ollama.model_name if is_available else None,
             "model_size": self.ollama.model_size,
-            "last_suggestion": self.last_suggestion_time,
+            "last_suggestion": self.last_suggestion_time.isoformat() if self.last_suggestion_time else None,
             "last_check": self.last_check_time
         }
         